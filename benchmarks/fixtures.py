@@ -0,0 +1,86 @@
+# benchmarks/fixtures.py
+"""Fixtures locais dos benchmarks: interpretadores falsos e índice de wheels."""
+import base64
+import hashlib
+import os
+import stat
+import zipfile
+from typing import List
+
+
+def _write_executable(path: str, content: str):
+    with open(path, "w") as f:
+        f.write(content)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def make_stub_interpreters(root: str, count: int, slow_ratio: float = 0.1,
+                           junk_ratio: float = 0.1, slow_delay: float = 0.1) -> List[str]:
+    """Cria `count` executáveis `python*` falsos distribuídos em alguns diretórios.
+
+    A maioria responde `--version` como um Python real; uma fração demora
+    `slow_delay` segundos (como shims do pyenv) e outra imprime lixo ou falha.
+    Retorna a lista de diretórios para montar o PATH.
+    """
+    if os.name == "nt":
+        raise RuntimeError("Interpretadores falsos só são suportados em sistemas POSIX")
+
+    dirs = [os.path.join(root, f"bin{i}") for i in range(max(1, count // 25))]
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+
+    slow_every = int(1 / slow_ratio) if slow_ratio else 0
+    junk_every = int(1 / junk_ratio) if junk_ratio else 0
+    for i in range(count):
+        path = os.path.join(dirs[i % len(dirs)], f"python3.{i % 14}-stub{i}")
+        if junk_every and i % junk_every == junk_every - 1:
+            body = "echo 'not a python'\nexit 1\n"
+        elif slow_every and i % slow_every == 0:
+            body = f"sleep {slow_delay}\necho 'Python 3.{i % 14}.{i % 7}'\n"
+        else:
+            body = f"echo 'Python 3.{i % 14}.{i % 7}'\n"
+        _write_executable(path, "#!/bin/sh\nPATH=/usr/bin:/bin\n" + body)
+
+    # Arquivos que não devem ser considerados: diretório e não executável
+    os.makedirs(os.path.join(dirs[0], "python-dir"), exist_ok=True)
+    with open(os.path.join(dirs[0], "python-notes.txt"), "w") as f:
+        f.write("não executável\n")
+    return dirs
+
+
+def _record_line(name: str, data: bytes) -> str:
+    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=")
+    return f"{name},sha256={digest.decode()},{len(data)}"
+
+
+def make_wheel(directory: str, name: str, version: str = "0.1") -> str:
+    """Gera uma wheel pura mínima e válida em `directory`."""
+    dist_info = f"{name}-{version}.dist-info"
+    files = {
+        f"{name}/__init__.py": f"__version__ = {version!r}\n".encode(),
+        f"{dist_info}/METADATA": (
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+        ).encode(),
+        f"{dist_info}/WHEEL": (
+            "Wheel-Version: 1.0\nGenerator: fvenv-benchmarks\n"
+            "Root-Is-Purelib: true\nTag: py3-none-any\n"
+        ).encode(),
+    }
+    record = [_record_line(n, d) for n, d in files.items()]
+    record.append(f"{dist_info}/RECORD,,")
+    files[f"{dist_info}/RECORD"] = ("\n".join(record) + "\n").encode()
+
+    path = os.path.join(directory, f"{name}-{version}-py3-none-any.whl")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for n, d in files.items():
+            zf.writestr(n, d)
+    return path
+
+
+def make_local_index(directory: str, count: int) -> List[str]:
+    """Cria um índice em diretório (para --find-links) com `count` wheels."""
+    os.makedirs(directory, exist_ok=True)
+    names = [f"fvenvbench{i}" for i in range(count)]
+    for name in names:
+        make_wheel(directory, name)
+    return names
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# benchmarks/run.py
+"""Benchmarks reprodutíveis dos caminhos críticos do fvenv.
+
+Tudo roda localmente: interpretadores falsos no PATH, wheels mínimas servidas
+por um índice em diretório (--find-links) e um FVENV_HOME temporário.
+
+Uso:
+    python benchmarks/run.py                    # roda e compara com baseline.json
+    python benchmarks/run.py --quick            # tamanhos menores
+    python benchmarks/run.py --save-baseline    # grava o resultado como baseline
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+sys.path.insert(0, ROOT)
+
+from fixtures import make_local_index, make_stub_interpreters  # noqa: E402
+
+
+def _median_time(fn: Callable[[], None], repeat: int,
+                 setup: Callable[[], None] = None) -> float:
+    """Mediana do tempo de `fn` em `repeat` execuções."""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_discovery(manager, work: str, sizes: List[int], repeat: int) -> Dict[str, float]:
+    """find_python_installations contra PATHs sintéticos de N stubs."""
+    results = {}
+    for n in sizes:
+        dirs = make_stub_interpreters(os.path.join(work, f"stubs-{n}"), n)
+        os.environ["PATH"] = os.pathsep.join(dirs)
+        # Busca completa; a nova busca reaproveita os stubs problemáticos do cache
+        results[f"discovery[n={n}]"] = _median_time(
+            lambda: manager.find_python_installations(force=True), repeat)
+        results[f"discovery-rescan[n={n}]"] = _median_time(manager.find_python_installations,
+                                                           repeat)
+    return results
+
+
+def bench_load_installations(manager, repeat: int) -> Dict[str, float]:
+    """load_installations com cache (warm) e sem cache (cold)."""
+    from fast_venv.config import CACHE_FILE
+
+    def drop_cache():
+        if os.path.exists(CACHE_FILE):
+            os.remove(CACHE_FILE)
+
+    cold = _median_time(manager.load_installations, repeat, setup=drop_cache)
+    manager.load_installations()
+    warm = _median_time(manager.load_installations, repeat)
+    return {"load_installations[cold]": cold, "load_installations[warm]": warm}
+
+
+def bench_create_venv(manager, work: str, sizes: List[int]) -> Dict[str, float]:
+    """create_venv com 0/5/20 pacotes vindos do índice local."""
+    from fast_venv.core.python_installation import PythonInstallation
+
+    index_dir = os.path.join(work, "index")
+    names = make_local_index(index_dir, max(sizes))
+    os.environ.update({
+        "PIP_NO_INDEX": "1",
+        "PIP_FIND_LINKS": index_dir,
+        "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+    })
+    version = platform.python_version()
+    python_inst = PythonInstallation(version, sys.executable)
+
+    results = {}
+    for n in sizes:
+        venv_dir = os.path.join(work, f"venv-{n}")
+        start = time.perf_counter()
+        manager.create_venv(python_inst, venv_dir, names[:n])
+        results[f"create_venv[packages={n}]"] = time.perf_counter() - start
+        shutil.rmtree(venv_dir)
+    return results
+
+
+def bench_cli_startup(repeat: int) -> Dict[str, float]:
+    """Tempo de inicialização do CLI (`--help`) em um processo novo."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+
+    def run():
+        subprocess.run([sys.executable, "-m", "fast_venv.cli", "--help"],
+                       env=env, check=True, stdout=subprocess.DEVNULL)
+
+    return {"cli_startup": _median_time(run, repeat)}
+
+
+def run_benchmarks(quick: bool) -> Dict[str, float]:
+    work = tempfile.mkdtemp(prefix="fvenv-bench-")
+    os.environ["FVENV_HOME"] = os.path.join(work, "home")
+    os.environ["PATH"] = os.path.join(work, "empty")
+    original_env = dict(os.environ)
+    try:
+        # Importar só depois de FVENV_HOME apontar para o diretório temporário
+        from fast_venv.core.venv_manager import VenvManager
+
+        manager = VenvManager()
+        repeat = 3 if quick else 5
+        results = {}
+        results.update(bench_discovery(manager, work, [10, 50] if quick else [10, 50, 200], repeat))
+        results.update(bench_load_installations(manager, repeat))
+        results.update(bench_create_venv(manager, work, [0, 5] if quick else [0, 5, 20]))
+        os.environ.clear()
+        os.environ.update(original_env)
+        results.update(bench_cli_startup(repeat))
+        return results
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float],
+            tolerance: float, min_delta: float) -> List[str]:
+    """Retorna as métricas mais lentas que o baseline além da tolerância."""
+    regressions = []
+    for name, base in sorted(baseline.items()):
+        current = results.get(name)
+        if current is None:
+            continue
+        if current > base * (1 + tolerance) and current - base > min_delta:
+            regressions.append(f"{name}: {base:.4f}s -> {current:.4f}s "
+                               f"(+{(current / base - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do fvenv")
+    parser.add_argument("--quick", action="store_true", help="Usar tamanhos menores")
+    parser.add_argument("--output", "-o", help="Arquivo JSON para os resultados")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Arquivo de baseline")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Gravar os resultados como novo baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Piora relativa aceita antes de acusar regressão (padrão: 0.25)")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="Piora absoluta mínima, em segundos, para acusar regressão")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.quick)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+
+    for name, seconds in sorted(results.items()):
+        print(f"{name:32} {seconds:10.4f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Baseline gravado em {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("Nenhum baseline encontrado; use --save-baseline para criar um.")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("platform") != report["meta"]["platform"]:
+        print("Aviso: baseline gravado em outra plataforma; compare com cautela.")
+
+    regressions = compare(results, baseline.get("results", {}),
+                          args.tolerance, args.min_delta)
+    if regressions:
+        print("\nRegressões de desempenho:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nSem regressões em relação ao baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,35 @@
 from .core.venv_manager import VenvManager
 from .core.package_manager import PackageManager
 from .core.python_installation import PythonInstallation
-from .ui.console import console
-from .ui.menus import show_menu, show_config_menu
-from .ui.prompts import select_packages
+from .core.async_api import VenvCreationResult, async_create_venv, async_discover
+from .core.events import Event, EventSink, JsonSink, NullSink, TextSink
 
 __version__ = "0.1.0"
 __all__ = [
     'VenvManager',
     'PackageManager',
     'PythonInstallation',
+    'VenvCreationResult',
+    'async_create_venv',
+    'async_discover',
+    'Event',
+    'EventSink',
+    'JsonSink',
+    'NullSink',
+    'TextSink',
+    'RichSink',
     'console',
     'show_menu',
     'show_config_menu',
     'select_packages'
-]
\ No newline at end of file
+]
+
+# A interface rich é carregada sob demanda para que o núcleo possa ser usado
+# sem importar (nem pagar o custo de) rich
+_UI_EXPORTS = {'RichSink', 'console', 'show_menu', 'show_config_menu', 'select_packages'}
+
+def __getattr__(name):
+    if name in _UI_EXPORTS:
+        from . import ui
+        return getattr(ui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
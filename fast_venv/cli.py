@@ -2,8 +2,18 @@
 import argparse
 import sys
 from typing import List, Optional
+from .config import GC_MAX_AGE_DAYS, PREFETCH_TOP_K
+from .core.cleanup import collect_garbage, parse_size, remove_garbage
+from .core.clone import CloneError, clone_env, env_python, move_env
+from .core.environment import activation_command
+from .core.events import (ACTIVATION, ENVIRONMENTS, GC_REPORT, INSTALLATIONS, PREFETCH,
+                          TIMINGS, UPGRADES, EventSink, JsonSink, TextSink, phase)
+from .core.pack import PackError, default_archive_name, pack_env, unpack_env
+from .core.prefetch import PREFETCH_LOG, prefetch, spawn_background
+from .core.registry import EnvRegistry, format_size
+from .core.upgrade import UPGRADE_WORKERS, managed_envs, upgrade_package
+from .core.timings import Timings
 from .core.venv_manager import VenvManager
-from .ui.console import console
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -20,92 +30,421 @@ Exemplos:
   # Criar venv com pacotes
   fvenv create meu_env -p numpy pandas matplotlib
   
+  # Criar venv a partir de requirements travado com hashes
+  fvenv create meu_env -r requirements.txt -c constraints.txt
+
+  # Mostrar o tempo gasto em cada fase da criação
+  fvenv create meu_env -p requests --timings
+
   # Listar versões Python disponíveis
   fvenv list
+
+  # Listar ambientes criados pelo fvenv
+  fvenv envs
+
+  # Atualizar um pacote em todos os ambientes do fvenv
+  fvenv upgrade requests --all
+
+  # Baixar antecipadamente os pacotes mais usados (em segundo plano)
+  fvenv prefetch --background
+
+  # Empacotar um ambiente e desempacotá-lo em outra máquina
+  fvenv pack meu_env -o meu_env.tar.zst --slim
+  fvenv unpack meu_env.tar.zst /opt/envs/meu_env
+
+  # Copiar ou mover um ambiente sem reinstalar os pacotes
+  fvenv clone meu_env meu_env_copia --hardlink
+  fvenv move meu_env /opt/envs/meu_env
+
+  # Ver o que a limpeza removeria (sem apagar nada)
+  fvenv gc --days 14 --budget 20G --dry-run
+
+  # Limpar sem confirmação (CI)
+  fvenv gc --days 14 --yes
+
+  # Saída em JSON (uma linha por evento) para CI e scripts
+  fvenv create meu_env -p requests --json
+
+Variáveis de ambiente:
+  FVENV_TRACE=arquivo.jsonl   anexa cada fase medida como uma linha JSON
+  FVENV_PROFILE=cprofile|wall  perfila a execução, como a opção global --profile[=modo]
 """
     )
     
     subparsers = parser.add_subparsers(dest='command', help='Comandos disponíveis')
+
+    # Opções de saída comuns a todos os comandos
+    output_parser = argparse.ArgumentParser(add_help=False)
+    output_parser.add_argument('--json', action='store_true',
+                               help='Emitir eventos e resultados como linhas JSON')
     
     # Comando create
-    create_parser = subparsers.add_parser('create', help='Criar novo ambiente virtual')
+    create_parser = subparsers.add_parser('create', parents=[output_parser],
+                                          help='Criar novo ambiente virtual')
     create_parser.add_argument('venv_dir', help='Nome/diretório do ambiente virtual')
     create_parser.add_argument('--python', '-py', 
                               help='Versão específica do Python (ex: 3.9)')
     create_parser.add_argument('--packages', '-p', nargs='+',
                               help='Pacotes para instalar')
+    create_parser.add_argument('--requirement', '-r', action='append', default=[],
+                              help='Instalar a partir de um arquivo de requisitos (aceita --hash)')
+    create_parser.add_argument('--constraint', '-c', action='append', default=[],
+                              help='Arquivo de restrições de versão')
+    create_parser.add_argument('--slim', action='store_true',
+                              help='Remover testes, bytecode de outras versões e documentação '
+                                   'dos pacotes após instalar')
+    create_parser.add_argument('--prefer-cache', action='store_true',
+                              help='Instalar do cache de wheels também pacotes sem versão fixa '
+                                   '(usa a versão do cache, não a mais recente do índice)')
+    create_parser.add_argument('--timings', action='store_true',
+                              help='Mostrar o tempo gasto em cada fase')
     
     # Comando list
-    list_parser = subparsers.add_parser('list', help='Listar versões Python disponíveis')
+    list_parser = subparsers.add_parser('list', parents=[output_parser],
+                                        help='Listar versões Python disponíveis')
+    list_parser.add_argument('--refresh', action='store_true',
+                             help='Refazer a busca e a verificação de todos os interpretadores')
+
+    # Comando envs
+    envs_parser = subparsers.add_parser('envs', parents=[output_parser],
+                                        help='Listar ambientes criados pelo fvenv')
+    envs_parser.add_argument('--no-refresh', action='store_true',
+                             help='Mostrar o registro sem verificar os ambientes em disco')
+    
+    # Comando upgrade
+    upgrade_parser = subparsers.add_parser('upgrade', parents=[output_parser],
+                                           help='Atualizar um pacote em ambientes do fvenv')
+    upgrade_parser.add_argument('package', help='Pacote a atualizar (ex: requests)')
+    upgrade_parser.add_argument('venv_dirs', nargs='*', help='Ambientes a atualizar')
+    upgrade_parser.add_argument('--all', action='store_true',
+                                help='Atualizar em todos os ambientes registrados')
+    upgrade_parser.add_argument('--path', action='append', default=[],
+                                help='Com --all, procurar também ambientes sob este diretório')
+    upgrade_parser.add_argument('--workers', type=int, default=UPGRADE_WORKERS,
+                                help=f'Atualizações em paralelo (padrão: {UPGRADE_WORKERS})')
+
+    # Comando prefetch
+    prefetch_parser = subparsers.add_parser('prefetch', parents=[output_parser],
+                                            help='Colocar os pacotes mais usados no cache local')
+    prefetch_parser.add_argument('--limit', '-k', type=int, default=PREFETCH_TOP_K,
+                                 help=f'Pacotes por versão de Python (padrão: {PREFETCH_TOP_K})')
+    prefetch_parser.add_argument('--index-url', help='Índice de pacotes a usar no pip')
+    prefetch_parser.add_argument('--find-links', action='append', default=[],
+                                 help='Diretório ou URL com distribuições (repassado ao pip)')
+    prefetch_parser.add_argument('--background', action='store_true',
+                                 help='Rodar em segundo plano com prioridade baixa')
+
+    # Comandos pack/unpack
+    pack_parser = subparsers.add_parser('pack', parents=[output_parser],
+                                        help='Empacotar um ambiente para outra máquina')
+    pack_parser.add_argument('venv_dir', help='Ambiente a empacotar')
+    pack_parser.add_argument('--output', '-o',
+                             help='Arquivo de saída (.tar.zst, .tar.gz ou .tar)')
+    pack_parser.add_argument('--slim', action='store_true',
+                             help='Omitir testes, bytecode de outras versões e documentação')
+    pack_parser.add_argument('--level', type=int, help='Nível de compressão')
+
+    unpack_parser = subparsers.add_parser('unpack', parents=[output_parser],
+                                          help='Desempacotar um ambiente em um diretório')
+    unpack_parser.add_argument('archive', help='Pacote criado com fvenv pack')
+    unpack_parser.add_argument('venv_dir', help='Diretório de destino')
+    unpack_parser.add_argument('--python', '-py',
+                               help='Versão ou caminho do interpretador (padrão: o original ou um da mesma versão)')
+
+    # Comandos clone/move
+    clone_parser = subparsers.add_parser('clone', parents=[output_parser],
+                                         help='Copiar um ambiente sem reinstalar os pacotes')
+    clone_parser.add_argument('src', help='Ambiente de origem')
+    clone_parser.add_argument('dst', help='Diretório de destino')
+    clone_parser.add_argument('--hardlink', action='store_true',
+                              help='Compartilhar com a origem os arquivos não alterados')
+
+    move_parser = subparsers.add_parser('move', parents=[output_parser],
+                                        help='Mover um ambiente para outro diretório')
+    move_parser.add_argument('src', help='Ambiente de origem')
+    move_parser.add_argument('dst', help='Diretório de destino')
+
+    # Comando gc
+    gc_parser = subparsers.add_parser('gc', parents=[output_parser],
+                                      help='Remover ambientes abandonados e caches antigos')
+    gc_parser.add_argument('--days', type=float, default=GC_MAX_AGE_DAYS,
+                           help=f'Dias sem uso até um item ser removido (padrão: {GC_MAX_AGE_DAYS})')
+    gc_parser.add_argument('--budget',
+                           help='Espaço máximo para ambientes e cache (ex: 20G); '
+                                'os menos usados recentemente são removidos primeiro')
+    gc_parser.add_argument('--path', action='append', default=[],
+                           help='Diretório extra onde procurar ambientes não registrados')
+    gc_parser.add_argument('--workers', type=int, default=8,
+                           help='Remoções em paralelo (padrão: 8)')
+    gc_parser.add_argument('--dry-run', action='store_true',
+                           help='Apenas mostrar o que seria removido')
+    gc_parser.add_argument('-y', '--yes', action='store_true',
+                           help='Remover ambientes sem pedir confirmação')
     
     return parser.parse_args()
 
+def make_sink(json_output: bool = False) -> EventSink:
+    """Escolhe o sink de eventos: JSON, texto simples (sem TTY) ou rich."""
+    if json_output:
+        return JsonSink()
+    if not sys.stdout.isatty():
+        return TextSink()
+    from .ui.rich_sink import RichSink
+    return RichSink()
+
 def find_python_version(manager: VenvManager, version: str) -> Optional[str]:
-    """Encontra instalação do Python que corresponde à versão especificada."""
-    for inst in manager.installations:
-        if inst.version.startswith(version):
-            return inst
-    return None
+    """Encontra instalação saudável do Python que corresponde à versão especificada."""
+    return manager.default_installation(version)
+
+def report_unhealthy(manager: VenvManager, version: Optional[str] = None):
+    """Explica por que interpretadores encontrados (da `version`, se dada) foram ignorados."""
+    for inst in manager.unhealthy:
+        if version is None or inst.version.startswith(version):
+            manager.sink.message(f"Ignorado: Python {inst.version} em {inst.executable} "
+                                 f"({', '.join(inst.problems)})", "warning")
 
 def cli_create_venv(manager: VenvManager, venv_dir: str, 
                    python_version: Optional[str] = None,
-                   packages: Optional[List[str]] = None):
+                   packages: Optional[List[str]] = None,
+                   show_timings: bool = False,
+                   requirement_files: Optional[List[str]] = None,
+                   constraint_files: Optional[List[str]] = None,
+                   slim: bool = False, prefer_cache: bool = False):
     """Cria ambiente virtual via CLI."""
+    sink = manager.sink
     try:
         # Selecionar versão do Python
         if python_version:
             python_inst = find_python_version(manager, python_version)
             if not python_inst:
-                console.print(f"[red]Versão Python {python_version} não encontrada![/red]")
-                available = "\n".join(f"- Python {inst.version}" 
-                                    for inst in manager.installations)
-                console.print(f"\nVersões disponíveis:\n{available}")
+                sink.message(f"Versão Python {python_version} não encontrada!", "error")
+                report_unhealthy(manager, python_version)
+                sink.emit(INSTALLATIONS,
+                          installations=[inst.to_dict() for inst in manager.installations])
                 sys.exit(1)
         else:
-            # Usar a versão mais recente
-            python_inst = sorted(manager.installations, 
-                               key=lambda x: (x.major_version, x.minor_version),
-                               reverse=True)[0]
+            # Usar a versão saudável mais recente (a de inicialização mais rápida)
+            python_inst = manager.default_installation()
+            if not python_inst:
+                sink.message("Nenhuma instalação do Python utilizável encontrada!", "error")
+                report_unhealthy(manager)
+                sys.exit(1)
         
         # Criar ambiente
-        console.print(f"[green]Usando Python {python_inst.version}[/green]")
-        manager.create_venv(python_inst, venv_dir, packages)
+        sink.message(f"Usando Python {python_inst.version}")
+        manager.create_venv(python_inst, venv_dir, packages, requirement_files,
+                            constraint_files, slim, prefer_cache)
         
         # Mostrar instruções de ativação
-        manager.show_activation_instructions(venv_dir)
+        sink.emit(ACTIVATION, venv_dir=venv_dir, command=activation_command(venv_dir))
+
+        if show_timings:
+            sink.emit(TIMINGS, spans=[span.to_dict() for span in manager.timings.spans])
         
     except Exception as e:
-        console.print(f"[red]Erro ao criar ambiente virtual: {e}[/red]")
+        sink.message(f"Erro ao criar ambiente virtual: {e}", "error")
         sys.exit(1)
 
-def cli_list_versions(manager: VenvManager):
+def cli_list_versions(manager: VenvManager, refresh: bool = False):
     """Lista versões Python disponíveis."""
+    if refresh:
+        manager.find_python_installations(force=True)
     if not manager.installations:
-        console.print("[red]Nenhuma instalação do Python encontrada![/red]")
+        manager.sink.message("Nenhuma instalação do Python encontrada!", "error")
+        report_unhealthy(manager)
         sys.exit(1)
         
-    console.print("\n[bold]Versões Python disponíveis:[/bold]")
-    for inst in sorted(manager.installations, 
-                      key=lambda x: (x.major_version, x.minor_version),
-                      reverse=True):
-        console.print(f"Python {inst.version} - {inst.executable}")
+    installations = sorted(manager.installations, 
+                           key=lambda x: (x.major_version, x.minor_version),
+                           reverse=True)
+    manager.sink.emit(INSTALLATIONS, installations=[inst.to_dict() for inst in installations],
+                      unhealthy=[inst.to_dict() for inst in manager.unhealthy])
+
+def cli_list_envs(sink: EventSink, refresh: bool = True):
+    """Lista os ambientes do registro, revalidando apenas os que mudaram."""
+    registry = EnvRegistry()
+    if refresh:
+        records = registry.refresh()
+    else:
+        records = list(registry.load().values())
+    records.sort(key=lambda r: r.last_used, reverse=True)
+    sink.emit(ENVIRONMENTS, envs=[record.to_dict() for record in records])
+
+def cli_upgrade(sink: EventSink, package: str, venv_dirs: List[str], all_envs: bool = False,
+                paths: Optional[List[str]] = None, workers: int = UPGRADE_WORKERS):
+    """Atualiza um pacote nos ambientes indicados ou em todos (`--all`)."""
+    if not venv_dirs and not all_envs:
+        sink.message("Indique os ambientes ou use --all.", "error")
+        sys.exit(1)
+
+    envs = managed_envs(venv_dirs, (paths or []) if all_envs else [])
+    if not envs:
+        sink.message("Nenhum ambiente do fvenv encontrado.", "warning")
+        return
+
+    sink.message(f"Atualizando {package} em {len(envs)} ambiente(s)...")
+    results = upgrade_package(package, envs, workers, sink)
+    results.sort(key=lambda r: r.venv_dir)
+    sink.emit(UPGRADES, package=package, results=[result.to_dict() for result in results])
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+def cli_prefetch(sink: EventSink, limit: int = PREFETCH_TOP_K,
+                 index_url: Optional[str] = None, find_links: Optional[List[str]] = None,
+                 background: bool = False):
+    """Coloca no cache de wheels os pacotes populares de cada versão de Python."""
+    index_args = ["--index-url", index_url] if index_url else []
+    for link in find_links or []:
+        index_args += ["--find-links", link]
+
+    if background:
+        pid = spawn_background(["--limit", str(limit), *index_args])
+        sink.message(f"Prefetch rodando em segundo plano (PID {pid}); log em {PREFETCH_LOG}")
+        return
+
+    manager = VenvManager(sink)
+    results = prefetch(manager.installations, limit, index_args, manager.package_manager, sink)
+    sink.emit(PREFETCH, results=[result.to_dict() for result in results])
+
+def cli_pack(sink: EventSink, venv_dir: str, output: Optional[str] = None,
+             slim: bool = False, level: Optional[int] = None):
+    """Empacota um ambiente em um único arquivo comprimido."""
+    timings = Timings()
+    output = output or default_archive_name(venv_dir)
+    try:
+        with phase(sink, timings, "pack", venv_dir=venv_dir):
+            summary = pack_env(venv_dir, output, slim, level)
+    except (PackError, OSError) as e:
+        sink.message(str(e), "error")
+        sys.exit(1)
+    EnvRegistry().touch(venv_dir)
+    sink.message(f"Pacote criado em {output}: {summary['files']} arquivos, "
+                 f"{summary['deduplicated']} duplicados, "
+                 f"{format_size(summary['bytes_in'])} -> {format_size(summary['bytes_out'])}",
+                 "success")
+    if summary["slim"]:
+        sink.message(f"Omitidos com --slim: {format_size(summary['slim']['bytes_saved'])}")
+
+def cli_unpack(sink: EventSink, archive: str, venv_dir: str, python: Optional[str] = None):
+    """Desempacota um ambiente e o ajusta ao novo diretório e interpretador."""
+    timings = Timings()
+    try:
+        with phase(sink, timings, "unpack", venv_dir=venv_dir):
+            python_inst, manifest = unpack_env(archive, venv_dir,
+                                               lambda: VenvManager(sink).installations, python)
+    except (PackError, OSError) as e:
+        sink.message(str(e), "error")
+        sys.exit(1)
+    EnvRegistry().register(venv_dir, python_inst)
+    sink.message(f"Ambiente de {manifest['original_path']} desempacotado em {venv_dir} "
+                 f"(Python {python_inst.version}, {timings.spans[-1].wall:.2f}s)", "success")
+    sink.emit(ACTIVATION, venv_dir=venv_dir, command=activation_command(venv_dir))
+
+def cli_clone(sink: EventSink, src: str, dst: str, hardlink: bool = False,
+              move: bool = False):
+    """Copia (ou move, com `move`) um ambiente e ajusta seus caminhos."""
+    timings = Timings()
+    try:
+        with phase(sink, timings, "move" if move else "clone", venv_dir=dst):
+            summary = move_env(src, dst) if move else clone_env(src, dst, hardlink)
+    except (CloneError, OSError) as e:
+        sink.message(str(e), "error")
+        sys.exit(1)
+
+    registry = EnvRegistry()
+    if move:
+        registry.unregister(src)
+    else:
+        registry.touch(src)
+    python_inst = env_python(dst)
+    if python_inst:
+        registry.register(dst, python_inst)
+
+    if summary.get("renamed"):
+        detail = "renomeado no lugar"
+    else:
+        detail = ", ".join(f"{count} {method}" for method, count in
+                           (("reflink", summary["reflinked"]), ("hardlink", summary["hardlinked"]),
+                            ("cópia", summary["copied"])) if count) or "vazio"
+    sink.message(f"Ambiente {'movido' if move else 'copiado'} para {dst} ({detail}; "
+                 f"{summary['rewritten']} arquivos ajustados, {timings.spans[-1].wall:.2f}s)",
+                 "success")
+    sink.emit(ACTIVATION, venv_dir=dst, command=activation_command(dst))
+
+def confirm_env_removal(sink: EventSink, items: list, assume_yes: bool = False) -> bool:
+    """Pergunta antes de remover ambientes; sem terminal, exige `--yes`."""
+    envs = [item for item in items if item.kind == "env"]
+    if not envs or assume_yes:
+        return True
+    if isinstance(sink, JsonSink) or not sys.stdin.isatty():
+        sink.message(f"{len(envs)} ambiente(s) mantido(s): use --yes para removê-los", "warning")
+        return False
+    sink.emit(GC_REPORT, items=[item.to_dict() for item in envs],
+              total=sum(item.size for item in envs), dry_run=True)
+    answer = input(f"Remover {len(envs)} ambiente(s)? [s/N] ").strip().lower()
+    return answer in ("s", "sim", "y", "yes")
+
+def cli_gc(sink: EventSink, days: float, budget: Optional[str] = None,
+           paths: Optional[List[str]] = None, workers: int = 8, dry_run: bool = False,
+           assume_yes: bool = False):
+    """Remove ambientes e caches abandonados, ou só relata com `dry_run`.
+
+    Ambientes só são removidos com `assume_yes` ou após confirmação.
+    """
+    try:
+        budget_bytes = parse_size(budget) if budget else None
+    except ValueError:
+        sink.message(f"Orçamento inválido: {budget}", "error")
+        sys.exit(1)
+
+    items = collect_garbage(days, budget_bytes, paths or [])
+    if not dry_run:
+        if not confirm_env_removal(sink, items, assume_yes):
+            items = [item for item in items if item.kind != "env"]
+        removed = remove_garbage(items, workers)
+        failed = [item for item in items if item.error]
+    else:
+        removed, failed = items, []
+    sink.emit(GC_REPORT, items=[item.to_dict() for item in removed],
+              total=sum(item.size for item in removed), dry_run=dry_run,
+              failed=[item.to_dict() for item in failed])
+    if failed:
+        sys.exit(1)
 
 def main_cli():
     """Função principal para interface de linha de comando."""
     args = parse_args()
-    manager = VenvManager()
+    sink = make_sink(getattr(args, 'json', False))
     
     if args.command == 'create':
-        cli_create_venv(manager, args.venv_dir, args.python, args.packages)
+        cli_create_venv(VenvManager(sink), args.venv_dir, args.python, args.packages,
+                        args.timings, args.requirement, args.constraint, args.slim,
+                        args.prefer_cache)
     elif args.command == 'list':
-        cli_list_versions(manager)
+        cli_list_versions(VenvManager(sink), args.refresh)
+    elif args.command == 'envs':
+        cli_list_envs(sink, not args.no_refresh)
+    elif args.command == 'upgrade':
+        cli_upgrade(sink, args.package, args.venv_dirs, args.all, args.path, args.workers)
+    elif args.command == 'prefetch':
+        cli_prefetch(sink, args.limit, args.index_url, args.find_links, args.background)
+    elif args.command == 'pack':
+        cli_pack(sink, args.venv_dir, args.output, args.slim, args.level)
+    elif args.command == 'unpack':
+        cli_unpack(sink, args.archive, args.venv_dir, args.python)
+    elif args.command in ('clone', 'move'):
+        cli_clone(sink, args.src, args.dst, getattr(args, 'hardlink', False),
+                  args.command == 'move')
+    elif args.command == 'gc':
+        cli_gc(sink, args.days, args.budget, args.path, args.workers, args.dry_run,
+               args.yes)
     else:
-        console.print("[red]Comando inválido! Use --help para ver os comandos disponíveis.[/red]")
+        sink.message("Comando inválido! Use --help para ver os comandos disponíveis.", "error")
         sys.exit(1)
 
 if __name__ == "__main__":
     try:
         main_cli()
     except KeyboardInterrupt:
-        console.print("\n[yellow]Operação cancelada pelo usuário.[/yellow]")
+        print("\nOperação cancelada pelo usuário.", file=sys.stderr)
         sys.exit(1)
\ No newline at end of file
@@ -2,10 +2,30 @@
 import os
 
 # Configurações
-CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".fvenv")
+# FVENV_HOME permite isolar o estado (ex.: em benchmarks ou CI)
+CONFIG_DIR = os.environ.get("FVENV_HOME") or os.path.join(os.path.expanduser("~"), ".fvenv")
 CACHE_FILE = os.path.join(CONFIG_DIR, "python_installations_cache.json")
 FAVORITE_PACKAGES_FILE = os.path.join(CONFIG_DIR, "favorite_packages.json")
+LOGS_DIR = os.path.join(CONFIG_DIR, "logs")
+REGISTRY_FILE = os.path.join(CONFIG_DIR, "envs.json")
+CACHE_DIR = os.path.join(CONFIG_DIR, "cache")
+WHEEL_CACHE_DIR = os.path.join(CACHE_DIR, "wheels")
 DEFAULT_PACKAGES = ["pip", "wheel", "setuptools"]
 
+# Popularidade de pacotes: meia-vida do decaimento e tamanho do índice top-k
+PACKAGE_SCORE_HALF_LIFE_DAYS = 30
+POPULAR_PACKAGES_TOP_K = 20
+
+# Pacotes populares por versão de Python colocados no cache pelo `fvenv prefetch`
+PREFETCH_TOP_K = 10
+
+# Saúde dos interpretadores: versão mínima (create usa `venv --upgrade-deps`, 3.9+)
+# e latência máxima de `python --version` (ex.: shims do pyenv levam segundos)
+MIN_PYTHON_VERSION = (3, 9)
+SLOW_STARTUP_MS = 1000
+
+# Coleta de lixo: dias sem uso até um ambiente ou cache ser considerado abandonado
+GC_MAX_AGE_DAYS = 30
+
 # Criar diretório de configuração se não existir
-os.makedirs(CONFIG_DIR, exist_ok=True)
\ No newline at end of file
+os.makedirs(CONFIG_DIR, exist_ok=True)
@@ -2,5 +2,9 @@
 from .python_installation import PythonInstallation
 from .package_manager import PackageManager
 from .venv_manager import VenvManager
+from .async_api import VenvCreationResult, async_create_venv, async_discover
+from .events import Event, EventSink, JsonSink, NullSink, TextSink
 
-__all__ = ['PythonInstallation', 'PackageManager', 'VenvManager']
\ No newline at end of file
+__all__ = ['PythonInstallation', 'PackageManager', 'VenvManager',
+           'VenvCreationResult', 'async_create_venv', 'async_discover',
+           'Event', 'EventSink', 'JsonSink', 'NullSink', 'TextSink']
\ No newline at end of file
@@ -0,0 +1,237 @@
+# fast_venv/core/async_api.py
+"""API assíncrona para embutir o fvenv em serviços baseados em asyncio.
+
+Nada aqui escreve no console: os resultados são devolvidos como objetos, o
+andamento é emitido como eventos para um `EventSink` opcional e a saída dos
+subprocessos vai para os logs em `<venv>/.fvenv-logs/`.
+"""
+import asyncio
+import functools
+import os
+import shutil
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..config import SLOW_STARTUP_MS
+from .discovery import (HEALTH_TIMEOUT, PROBE_TIMEOUT, PROBE_WORKERS, health_command,
+                        interpreter_signature, iter_candidates, parse_health_output,
+                        parse_version_output)
+from .events import (PACKAGE_FAILED, PACKAGE_INSTALLED, VENV_CREATED, EventSink,
+                     NullSink, phase)
+from .environment import (get_pip_path, get_python_path, pin_requirements,
+                          write_metadata, write_requirements)
+from .package_manager import PackageManager
+from .registry import EnvRegistry
+from .process import LOG_DIR_NAME, CommandError, async_run_logged, log_name, observed
+from .python_installation import PythonInstallation
+from .timings import Span, Timings
+from .wheel_cache import artifact_version, cached_artifact, install_commands
+
+
+class VenvCreationResult:
+    """Resultado de `async_create_venv`."""
+
+    def __init__(self, venv_dir: str, python: PythonInstallation):
+        self.venv_dir = venv_dir
+        self.python = python
+        self.installed: List[str] = []
+        self.failed: Dict[str, CommandError] = {}
+        self.requirements_file: Optional[str] = None
+        self.metadata_file: Optional[str] = None
+        self.spans: List[Span] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def to_dict(self) -> dict:
+        return {
+            "venv_dir": self.venv_dir,
+            "python": self.python.to_dict(),
+            "installed": self.installed,
+            "failed": {package: {"returncode": e.returncode, "log": e.log_path}
+                       for package, e in self.failed.items()},
+            "requirements_file": self.requirements_file,
+            "metadata_file": self.metadata_file,
+            "timings": [span.to_dict() for span in self.spans]
+        }
+
+
+async def _run(cmd: List[str], semaphore: asyncio.Semaphore, timeout: float,
+               kind: Optional[str] = None) -> Optional[Tuple[str, str, float]]:
+    """Executa `cmd` respeitando o limite de concorrência.
+
+    Retorna (stdout, stderr, duração em ms), ou None se o comando não puder
+    ser executado ou passar de `timeout`.
+    """
+    async with semaphore:
+        with observed(cmd, kind):
+            start = time.perf_counter()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            except OSError:
+                return None
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return None
+            except asyncio.CancelledError:
+                proc.kill()
+                await asyncio.shield(proc.wait())
+                raise
+            elapsed = (time.perf_counter() - start) * 1000
+    return stdout.decode(errors="replace"), stderr.decode(errors="replace"), elapsed
+
+
+async def _check_health(executable: str, semaphore: asyncio.Semaphore) -> Tuple[bool, bool]:
+    output = await _run(health_command(executable), semaphore, HEALTH_TIMEOUT, "health")
+    return parse_health_output(output[0]) if output else (False, False)
+
+
+async def _probe(file_path: str, semaphore: asyncio.Semaphore,
+                 timeout: float) -> Optional[PythonInstallation]:
+    """Consulta `--version` em um candidato, como `probe_interpreter`."""
+    output = await _run([file_path, "--version"], semaphore, timeout)
+    if output is None:
+        return None
+    stdout, stderr, startup_ms = output
+    version = parse_version_output(stdout, stderr)
+    if not version:
+        return None
+    if startup_ms > SLOW_STARTUP_MS:
+        # Uma segunda medida evita descartar o interpretador por um atraso passageiro
+        retry = await _run([file_path, "--version"], semaphore, timeout)
+        if retry is not None:
+            startup_ms = min(startup_ms, retry[2])
+    return PythonInstallation(version, os.path.abspath(file_path), round(startup_ms, 1),
+                              signature=interpreter_signature(file_path),
+                              checked_at=time.time())
+
+
+async def async_discover(path: Optional[str] = None, concurrency: int = PROBE_WORKERS,
+                         timeout: float = PROBE_TIMEOUT,
+                         include_unhealthy: bool = False) -> List[PythonInstallation]:
+    """Descobre interpretadores no PATH consultando vários candidatos em paralelo.
+
+    Aplica as mesmas verificações da busca síncrona (versão mínima, venv,
+    ensurepip e tempo de inicialização) e, por padrão, devolve só as
+    instalações saudáveis; com `include_unhealthy`, devolve todas e os
+    motivos ficam em `inst.problems`. Como na busca síncrona, a saúde só é
+    verificada depois de todas as consultas cronometradas, uma vez por
+    executável real, e `concurrency` é limitado por padrão aos núcleos
+    disponíveis. Não lê nem grava o cache de instalações; a ordem segue a
+    do PATH.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*(
+        _probe(file_path, semaphore, timeout) for file_path in iter_candidates(path)
+    ))
+    found = [inst for inst in results if inst is not None]
+
+    by_real: Dict[str, List[PythonInstallation]] = {}
+    for inst in found:
+        if inst.supported:
+            by_real.setdefault(os.path.realpath(inst.executable), []).append(inst)
+    health = await asyncio.gather(*(
+        _check_health(insts[0].executable, semaphore) for insts in by_real.values()
+    ))
+    for insts, (venv_ok, ensurepip_ok) in zip(by_real.values(), health):
+        for inst in insts:
+            inst.venv_ok, inst.ensurepip_ok = venv_ok, ensurepip_ok
+    return [inst for inst in found if include_unhealthy or inst.healthy]
+
+
+async def async_create_venv(python_inst: PythonInstallation, venv_dir: str,
+                            requirements: Optional[List[str]] = None,
+                            package_manager: Optional[PackageManager] = None,
+                            sink: Optional[EventSink] = None,
+                            prefer_cache: bool = False) -> VenvCreationResult:
+    """Cria e configura um ambiente virtual sem bloquear o event loop.
+
+    Como em `VenvManager.create_venv`, só pacotes com versão fixa são
+    instalados do cache de wheels, a menos que `prefer_cache` seja dado; a
+    versão usada fica no atributo "version" da fase de instalação.
+    Falhas ao instalar pacotes individuais são registradas em `result.failed`.
+    Se a criação do ambiente falhar ou a tarefa for cancelada, o diretório
+    parcial é removido e a exceção é propagada.
+    """
+    result = VenvCreationResult(venv_dir, python_inst)
+    sink = sink or NullSink()
+    timings = Timings()
+    log_dir = os.path.join(venv_dir, LOG_DIR_NAME)
+    # Locks, leituras e escritas em disco rodam no executor para não bloquear o event loop
+    loop = asyncio.get_running_loop()
+    try:
+        with phase(sink, timings, "venv", python=python_inst.version):
+            await async_run_logged(
+                [python_inst.executable, "-m", "venv", "--upgrade-deps", venv_dir],
+                os.path.join(log_dir, "venv.log")
+            )
+
+        pip_cmd = [get_pip_path(venv_dir)]
+        with phase(sink, timings, "pip_check"):
+            try:
+                await async_run_logged([*pip_cmd, "--version"],
+                                       os.path.join(log_dir, "pip-check.log"))
+            except (CommandError, OSError):
+                pip_cmd = [get_python_path(venv_dir), "-m", "pip"]
+
+        for package in requirements or []:
+            try:
+                with phase(sink, timings, "install", package=package) as span:
+                    commands = await loop.run_in_executor(
+                        None, functools.partial(install_commands, pip_cmd, package,
+                                                prefer_cache=prefer_cache))
+                    for index, cmd in enumerate(commands):
+                        try:
+                            await async_run_logged(
+                                cmd, os.path.join(log_dir, f"install-{log_name(package)}.log"))
+                            span["source"] = "cache" if index < len(commands) - 1 else "index"
+                            if span["source"] == "cache":
+                                artifact = await loop.run_in_executor(
+                                    None, functools.partial(cached_artifact, package,
+                                                            any_version=prefer_cache))
+                                span["version"] = artifact_version(artifact) if artifact else "?"
+                            break
+                        except CommandError:
+                            if index == len(commands) - 1:
+                                raise
+            except CommandError as e:
+                result.failed[package] = e
+                sink.emit(PACKAGE_FAILED, package=package, returncode=e.returncode,
+                          log=e.log_path, tail=e.tail)
+                continue
+            result.installed.append(package)
+            if package_manager is not None:
+                await loop.run_in_executor(None, package_manager.add_package_usage,
+                                           package, python_inst.version)
+            sink.emit(PACKAGE_INSTALLED, package=package)
+
+        with phase(sink, timings, "requirements"):
+            freeze: List[str] = []
+            await async_run_logged([*pip_cmd, "freeze"],
+                                   os.path.join(log_dir, "freeze.log"), freeze.append)
+            result.requirements_file = await loop.run_in_executor(
+                None, write_requirements, venv_dir, pin_requirements(result.installed, freeze))
+
+        with phase(sink, timings, "metadata"):
+            result.metadata_file = await loop.run_in_executor(
+                None, write_metadata, venv_dir, python_inst, timings.spans)
+            await loop.run_in_executor(None, EnvRegistry().register, venv_dir, python_inst)
+    except BaseException:
+        # Inclui CancelledError: não deixar ambientes pela metade. A remoção
+        # roda no executor e é protegida de um novo cancelamento.
+        if os.path.exists(venv_dir):
+            await asyncio.shield(loop.run_in_executor(
+                None, functools.partial(shutil.rmtree, venv_dir, ignore_errors=True)))
+        raise
+
+    result.spans = timings.spans
+    sink.emit(VENV_CREATED, **result.to_dict())
+    return result
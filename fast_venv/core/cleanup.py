@@ -0,0 +1,266 @@
+# fast_venv/core/cleanup.py
+"""Coleta de lixo: ambientes abandonados, caches e arquivos órfãos do fvenv."""
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from ..config import CACHE_DIR, CONFIG_DIR, LOGS_DIR, WHEEL_CACHE_DIR
+from .environment import METADATA_FILE_NAME, read_metadata
+from .registry import EnvRecord, EnvRegistry, dir_size
+from .state import locked
+
+# Motivos de remoção
+REASON_UNUSED = "unused"
+REASON_MISSING_PYTHON = "missing_python"
+REASON_STALE_CACHE = "stale_cache"
+REASON_STALE_LOG = "stale_log"
+REASON_TEMP_FILE = "temp_file"
+REASON_BUDGET = "budget"
+
+# Arquivos temporários de escritas atômicas abandonados há mais que isso (s)
+TEMP_FILE_MAX_AGE = 3600
+
+# Profundidade máxima ao procurar ambientes em diretórios extras
+SCAN_MAX_DEPTH = 4
+
+_UNITS = {"": 1, "B": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+
+def parse_size(text: str) -> int:
+    """Converte tamanhos como '500M', '10G' ou '2048' em bytes."""
+    value = text.strip().upper().rstrip("B") or "0"
+    unit = value[-1] if value[-1] in _UNITS else ""
+    number = value[:-1] if unit else value
+    return int(float(number) * _UNITS[unit])
+
+
+class GcItem:
+    """Um caminho que pode ser removido, com o motivo e o tamanho."""
+
+    def __init__(self, path: str, kind: str, reason: str, size: int, last_used: float):
+        self.path = path
+        self.kind = kind  # "env", "cache", "log" ou "temp"
+        self.reason = reason
+        self.size = size
+        self.last_used = last_used
+        self.error: Optional[str] = None  # preenchido se a remoção falhar
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "kind": self.kind,
+            "reason": self.reason,
+            "size": self.size,
+            "last_used": self.last_used,
+            "error": self.error
+        }
+
+
+def _is_fvenv_env(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, METADATA_FILE_NAME))
+
+
+def find_envs(roots: Iterable[str], max_depth: int = SCAN_MAX_DEPTH) -> List[str]:
+    """Procura ambientes do fvenv (com .venv-metadata.json) sob `roots`."""
+    found = []
+    for root in roots:
+        stack = [(os.path.abspath(root), 0)]
+        while stack:
+            path, depth = stack.pop()
+            if _is_fvenv_env(path):
+                found.append(path)
+                continue
+            if depth >= max_depth:
+                continue
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, depth + 1))
+            except OSError:
+                continue
+    return found
+
+
+def _record_for(path: str) -> EnvRecord:
+    """Monta um registro para um ambiente encontrado fora do registro."""
+    metadata = read_metadata(path) or {}
+    record = EnvRecord(path, metadata.get("python_version", ""),
+                       metadata.get("python_path", ""))
+    record.refresh()
+    return record
+
+
+def _stale_files(directory: str, kind: str, reason: str, max_age: float,
+                 now: float, top_level_only: bool = False) -> List[GcItem]:
+    """Arquivos (ou entradas de primeiro nível) sem uso há mais de `max_age`.
+
+    Arquivos de lock (`*.lock`) nunca entram: outro processo pode estar usando.
+    """
+    items = []
+    if not os.path.isdir(directory):
+        return items
+    if top_level_only:
+        entries = [entry.path for entry in os.scandir(directory)]
+    else:
+        entries = [os.path.join(root, name)
+                   for root, _, files in os.walk(directory) for name in files]
+    for path in entries:
+        if path.endswith(".lock"):
+            continue
+        try:
+            st = os.lstat(path)
+        except OSError:
+            continue
+        last_used = max(st.st_atime, st.st_mtime)
+        if now - last_used > max_age:
+            size = dir_size(path) if os.path.isdir(path) else st.st_size
+            items.append(GcItem(path, kind, reason, size, last_used))
+    return items
+
+
+def collect_garbage(max_age_days: float, budget: Optional[int] = None,
+                    extra_roots: Iterable[str] = (),
+                    registry: Optional[EnvRegistry] = None) -> List[GcItem]:
+    """Calcula o que pode ser removido, sem remover nada.
+
+    - ambientes sem uso há mais de `max_age_days` dias;
+    - ambientes cujo interpretador (`python_path` dos metadados) não existe mais;
+    - arquivos de cache e logs sem uso há mais de `max_age_days` dias;
+    - temporários de escritas atômicas interrompidas;
+    - se `budget` (bytes) for dado, ambientes e caches menos usados recentemente
+      até que o total restante caiba no orçamento (LRU).
+    """
+    registry = registry or EnvRegistry()
+    now = time.time()
+    max_age = max_age_days * 86400
+
+    records = {record.path: record for record in registry.refresh()}
+    for path in find_envs(extra_roots):
+        if path not in records:
+            records[path] = _record_for(path)
+
+    items: List[GcItem] = []
+    kept: List[GcItem] = []
+    for record in records.values():
+        if not _is_fvenv_env(record.path):
+            continue
+        item = GcItem(record.path, "env", "", record.size, record.last_used)
+        if record.python_path and not os.path.exists(record.python_path):
+            item.reason = REASON_MISSING_PYTHON
+        elif now - record.last_used > max_age:
+            item.reason = REASON_UNUSED
+        (items if item.reason else kept).append(item)
+
+    cache_items = _stale_files(CACHE_DIR, "cache", REASON_STALE_CACHE, 0, now)
+    for item in cache_items:
+        (items if now - item.last_used > max_age else kept).append(item)
+    items.extend(_stale_files(LOGS_DIR, "log", REASON_STALE_LOG, max_age, now,
+                              top_level_only=True))
+    items.extend(item for item in _stale_files(CONFIG_DIR, "temp", REASON_TEMP_FILE,
+                                               TEMP_FILE_MAX_AGE, now, top_level_only=True)
+                 if item.path.endswith(".tmp"))
+
+    if budget is not None:
+        total = sum(item.size for item in kept)
+        for item in sorted(kept, key=lambda i: i.last_used):
+            if total <= budget:
+                break
+            item.reason = REASON_BUDGET
+            items.append(item)
+            total -= item.size
+
+    return items
+
+
+def _removal_tasks(path: str, fanout: int) -> List[str]:
+    """Divide a remoção de `path` em subárvores para paralelizar o rmtree."""
+    tasks = [path]
+    for _ in range(3):
+        if len(tasks) >= fanout:
+            break
+        expanded = []
+        for task in tasks:
+            if os.path.isdir(task) and not os.path.islink(task):
+                try:
+                    expanded.extend(entry.path for entry in os.scandir(task))
+                except OSError:
+                    expanded.append(task)
+            else:
+                expanded.append(task)
+        tasks = expanded
+    return tasks
+
+
+def _remove(path: str) -> Optional[str]:
+    """Remove `path`; retorna a primeira falha encontrada, ou None."""
+    errors: List[str] = []
+
+    def on_error(func, failed_path, exc):
+        if not isinstance(exc, FileNotFoundError):
+            errors.append(f"{failed_path}: {getattr(exc, 'strerror', None) or exc}")
+
+    try:
+        if os.path.isdir(path) and not os.path.islink(path):
+            if sys.version_info >= (3, 12):
+                shutil.rmtree(path, onexc=on_error)
+            else:
+                shutil.rmtree(path, onerror=lambda func, p, info: on_error(func, p, info[1]))
+        else:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        errors.append(f"{path}: {e.strerror or e}")
+    return errors[0] if errors else None
+
+
+def parallel_rmtree(paths: List[str], workers: int = 8) -> Dict[str, str]:
+    """Remove vários caminhos em paralelo, dividindo árvores grandes em subárvores.
+
+    Retorna {caminho: erro} dos caminhos que não puderam ser removidos.
+    """
+    tasks = [(path, task) for path in paths for task in _removal_tasks(path, workers * 4)]
+    errors: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for (path, _), error in zip(tasks, pool.map(_remove, [task for _, task in tasks])):
+            if error:
+                errors.setdefault(path, error)
+    # Remove o que restou das raízes (diretórios já esvaziados)
+    remaining = [path for path in paths if os.path.lexists(path)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path, error in zip(remaining, pool.map(_remove, remaining)):
+            if error:
+                errors.setdefault(path, error)
+    return {path: errors.get(path, "não removido") for path in paths
+            if os.path.lexists(path)}
+
+
+def remove_garbage(items: List[GcItem], workers: int = 8,
+                   registry: Optional[EnvRegistry] = None) -> List[GcItem]:
+    """Remove os itens coletados e tira os ambientes removidos do registro.
+
+    Itens do cache são removidos com o lock do cache de wheels, para não
+    competir com downloads em andamento (`prefetch`, `upgrade`). Falhas não
+    interrompem a limpeza: ficam em `item.error`, e o ambiente continua no
+    registro. Retorna os itens de fato removidos.
+    """
+    registry = registry or EnvRegistry()
+    errors = parallel_rmtree([item.path for item in items if item.kind != "cache"], workers)
+    cache_paths = [item.path for item in items if item.kind == "cache"]
+    if cache_paths:
+        with locked(WHEEL_CACHE_DIR):
+            errors.update(parallel_rmtree(cache_paths, workers))
+
+    removed = []
+    for item in items:
+        item.error = errors.get(item.path)
+        if item.error is None:
+            removed.append(item)
+    gone = [item.path for item in removed if item.kind == "env"]
+    if gone:
+        registry.unregister(*gone)
+    return removed
@@ -0,0 +1,144 @@
+# fast_venv/core/clone.py
+"""Cópia e movimentação de ambientes sem reinstalar pacotes.
+
+Os arquivos são copiados por reflink (cópia sob demanda em btrfs/XFS), por
+hardlink quando pedido, ou por cópia comum como último recurso. Depois, os
+caminhos absolutos do ambiente de origem são reescritos em uma única passada
+(`relocate`); como a reescrita grava arquivos novos, os hardlinks dos arquivos
+alterados são desfeitos e a origem não é afetada.
+"""
+import errno
+import os
+import shutil
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from .environment import read_metadata, update_metadata
+from .process import LOG_DIR_NAME
+from .python_installation import PythonInstallation
+from .relocate import relocate
+
+# ioctl(FICLONE) do Linux: o destino compartilha os blocos da origem
+FICLONE = 0x40049409
+
+
+class CloneError(Exception):
+    """Erro ao clonar ou mover um ambiente."""
+
+
+class _Copier:
+    """Função de cópia para `shutil.copytree` que conta o método usado."""
+
+    def __init__(self, hardlink: bool = False):
+        self.hardlink = hardlink
+        self.reflink = fcntl is not None and hasattr(fcntl, "ioctl")
+        self.counts = {"reflinked": 0, "hardlinked": 0, "copied": 0}
+
+    def _try_reflink(self, src: str, dst: str) -> bool:
+        try:
+            with open(src, "rb") as s, open(dst, "wb") as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            # Sistema de arquivos sem suporte: não tentar de novo nos próximos
+            self.reflink = False
+            if os.path.exists(dst):
+                os.remove(dst)
+            return False
+        shutil.copystat(src, dst)
+        return True
+
+    def __call__(self, src: str, dst: str) -> str:
+        if self.hardlink:
+            try:
+                os.link(src, dst)
+                self.counts["hardlinked"] += 1
+                return dst
+            except OSError:
+                self.hardlink = False  # outro sistema de arquivos
+        if self.reflink and self._try_reflink(src, dst):
+            self.counts["reflinked"] += 1
+            return dst
+        shutil.copy2(src, dst)
+        self.counts["copied"] += 1
+        return dst
+
+
+def _check_paths(src: str, dst: str):
+    if not os.path.isfile(os.path.join(src, "pyvenv.cfg")):
+        raise CloneError(f"{src} não é um ambiente virtual")
+    if os.path.exists(dst) and (not os.path.isdir(dst) or os.listdir(dst)):
+        raise CloneError(f"{dst} já existe e não está vazio")
+    if dst == src or dst.startswith(src + os.sep):
+        raise CloneError(f"{dst} não pode ficar dentro de {src}")
+
+
+def env_python(venv_dir: str) -> Optional[PythonInstallation]:
+    """Interpretador base registrado nos metadados do ambiente, se houver."""
+    metadata = read_metadata(venv_dir) or {}
+    if metadata.get("python_version") and metadata.get("python_path"):
+        return PythonInstallation(metadata["python_version"], metadata["python_path"])
+    return None
+
+
+def _copy_env(src: str, dst: str, hardlink: bool) -> dict:
+    copier = _Copier(hardlink)
+    if os.path.isdir(dst):
+        os.rmdir(dst)  # vazio (verificado antes); copytree cria o destino
+    shutil.copytree(src, dst, symlinks=True, copy_function=copier,
+                    ignore=lambda root, names: [LOG_DIR_NAME] if root == src else [])
+    return copier.counts
+
+
+def _clone(src: str, dst: str, hardlink: bool) -> dict:
+    """Copia e reescreve os caminhos; remove o destino parcial em caso de erro."""
+    try:
+        summary = _copy_env(src, dst, hardlink)
+        summary["rewritten"] = relocate(dst, src)
+    except BaseException:
+        shutil.rmtree(dst, ignore_errors=True)
+        raise
+    return summary
+
+
+def clone_env(src: str, dst: str, hardlink: bool = False) -> dict:
+    """Copia o ambiente `src` para `dst` e ajusta os caminhos; retorna um resumo.
+
+    Com `hardlink`, arquivos não alterados pela reescrita ficam compartilhados
+    com a origem. Os logs da origem não são copiados. Em caso de erro o
+    destino parcial é removido.
+    """
+    src, dst = os.path.abspath(src), os.path.abspath(dst)
+    _check_paths(src, dst)
+    summary = _clone(src, dst, hardlink)
+    update_metadata(dst, cloned_from=src)
+    return summary
+
+
+def move_env(src: str, dst: str) -> dict:
+    """Move o ambiente `src` para `dst` e ajusta os caminhos; retorna um resumo.
+
+    No mesmo sistema de arquivos é só um `rename`; entre sistemas diferentes,
+    o ambiente é clonado e a origem removida depois que a cópia terminar.
+    """
+    src, dst = os.path.abspath(src), os.path.abspath(dst)
+    _check_paths(src, dst)
+    summary = {"renamed": False}
+    try:
+        if os.path.isdir(dst):
+            os.rmdir(dst)
+        os.rename(src, dst)
+        summary["renamed"] = True
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    if not summary["renamed"]:
+        summary.update(_clone(src, dst, hardlink=False))
+        shutil.rmtree(src)
+        return summary
+
+    summary["rewritten"] = relocate(dst, src)
+    return summary
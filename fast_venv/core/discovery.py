@@ -0,0 +1,159 @@
+# fast_venv/core/discovery.py
+"""Funções compartilhadas pela descoberta síncrona e assíncrona de interpretadores."""
+import glob
+import json
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..config import SLOW_STARTUP_MS
+from .process import observed
+from .python_installation import PythonInstallation
+
+# Tempo máximo (segundos) para um interpretador responder a `--version`
+PROBE_TIMEOUT = 2
+# Tempo máximo para a verificação de venv/ensurepip
+HEALTH_TIMEOUT = 15
+# Candidatos consultados em paralelo na busca síncrona (limitado aos núcleos
+# disponíveis, para que a concorrência não distorça a latência medida)
+PROBE_WORKERS = min(8, os.cpu_count() or 1)
+
+# Importa venv e confere que o ensurepip tem o pip embutido (distros às vezes o removem)
+_HEALTH_SCRIPT = """
+import json
+result = {}
+try:
+    import venv
+    result["venv"] = True
+except Exception:
+    result["venv"] = False
+try:
+    import ensurepip
+    result["ensurepip"] = bool(ensurepip.version())
+except Exception:
+    result["ensurepip"] = False
+print(json.dumps(result))
+"""
+
+
+def iter_candidates(path: Optional[str] = None) -> Iterator[str]:
+    """Gera os executáveis `python*` do PATH, sem repetição e na ordem do PATH."""
+    seen_paths = set()
+    if path is None:
+        path = os.environ.get("PATH", "")
+    for directory in path.split(os.pathsep):
+        if not os.path.exists(directory):
+            continue
+
+        pattern = os.path.join(directory, "python*")
+        for file_path in glob.glob(pattern):
+            if os.path.isdir(file_path) or file_path in seen_paths:
+                continue
+            if os.access(file_path, os.X_OK):
+                seen_paths.add(file_path)
+                yield file_path
+
+
+def parse_version_output(stdout: str, stderr: str) -> Optional[str]:
+    """Extrai a versão da saída de `python --version` ou None se não for Python."""
+    output = stdout.strip() or stderr.strip()
+    if not output.startswith("Python"):
+        return None
+    parts = output.split()
+    if len(parts) < 2:
+        return None
+    version = parts[1]
+    try:
+        int(version.split('.')[0])
+        int(version.split('.')[1])
+    except (IndexError, ValueError):
+        return None
+    return version
+
+
+def interpreter_signature(path: str) -> Optional[list]:
+    """Identifica o executável real: muda se o interpretador for substituído."""
+    try:
+        real = os.path.realpath(path)
+        st = os.stat(real)
+    except OSError:
+        return None
+    return [real, st.st_mtime_ns, st.st_size]
+
+
+def health_command(executable: str) -> List[str]:
+    """Comando que verifica venv/ensurepip; a saída vai para `parse_health_output`."""
+    return [executable, "-I", "-c", _HEALTH_SCRIPT]
+
+
+def parse_health_output(stdout: str) -> Tuple[bool, bool]:
+    """(venv funciona, ensurepip funciona) a partir da saída de `health_command`."""
+    try:
+        data = json.loads(stdout)
+        return bool(data.get("venv")), bool(data.get("ensurepip"))
+    except (ValueError, AttributeError):
+        return False, False
+
+
+def check_health(executable: str) -> Tuple[bool, bool]:
+    """(venv funciona, ensurepip funciona) para `executable`."""
+    try:
+        cmd = health_command(executable)
+        with observed(cmd, "health"):
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=HEALTH_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return False, False
+    return parse_health_output(result.stdout)
+
+
+def _timed_version(path: str) -> Tuple[subprocess.CompletedProcess, float]:
+    """Executa `path --version`; retorna o resultado e a duração em milissegundos."""
+    start = time.perf_counter()
+    with observed([path, "--version"]):
+        result = subprocess.run([path, "--version"], capture_output=True, text=True,
+                                timeout=PROBE_TIMEOUT)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def probe_interpreter(path: str) -> Optional[PythonInstallation]:
+    """Consulta `path --version`; retorna a instalação (saúde ainda não verificada).
+
+    A latência do `--version` é a medida de inicialização (shims que demoram
+    segundos ficam de fora). Para que ela não seja distorcida, a verificação
+    de saúde (`check_installations`) deve rodar só depois de todas as
+    consultas.
+    """
+    try:
+        result, startup_ms = _timed_version(path)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    version = parse_version_output(result.stdout, result.stderr)
+    if not version:
+        return None
+    if startup_ms > SLOW_STARTUP_MS:
+        # Uma segunda medida evita descartar o interpretador por um atraso passageiro
+        try:
+            startup_ms = min(startup_ms, _timed_version(path)[1])
+        except (OSError, subprocess.SubprocessError):
+            pass
+    return PythonInstallation(version, os.path.abspath(path), round(startup_ms, 1),
+                              signature=interpreter_signature(path), checked_at=time.time())
+
+
+def check_installations(installations: List[PythonInstallation], workers: int = PROBE_WORKERS):
+    """Preenche venv_ok/ensurepip_ok das instalações suportadas, em paralelo.
+
+    A verificação roda uma vez por executável real (links do mesmo
+    interpretador compartilham o resultado).
+    """
+    by_real: Dict[str, List[PythonInstallation]] = {}
+    for inst in installations:
+        if inst.supported:
+            by_real.setdefault(os.path.realpath(inst.executable), []).append(inst)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(check_health, [insts[0].executable for insts in by_real.values()])
+        for insts, (venv_ok, ensurepip_ok) in zip(by_real.values(), results):
+            for inst in insts:
+                inst.venv_ok, inst.ensurepip_ok = venv_ok, ensurepip_ok
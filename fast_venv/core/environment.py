@@ -0,0 +1,139 @@
+# fast_venv/core/environment.py
+"""Caminhos e arquivos gerados dentro de um ambiente virtual do fvenv."""
+import os
+import platform
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .python_installation import PythonInstallation
+from .state import read_state, write_state
+from .timings import Span
+
+METADATA_FILE_NAME = ".venv-metadata.json"
+METADATA_SCHEMA_VERSION = 1
+REQUIREMENTS_FILE_NAME = "requirements.txt"
+
+
+def get_pip_path(venv_dir: str) -> str:
+    """Retorna o caminho do executável pip no ambiente virtual."""
+    if os.name == "nt":
+        return os.path.join(venv_dir, "Scripts", "pip.exe")
+    return os.path.join(venv_dir, "bin", "pip")
+
+
+def get_python_path(venv_dir: str) -> str:
+    """Retorna o caminho do interpretador Python do ambiente virtual."""
+    if os.name == "nt":
+        return os.path.join(venv_dir, "Scripts", "python.exe")
+    return os.path.join(venv_dir, "bin", "python")
+
+
+def activation_command(venv_dir: str) -> str:
+    """Comando para ativar o ambiente virtual no shell padrão da plataforma."""
+    if os.name == "nt":
+        return f"{venv_dir}\\Scripts\\activate.bat"
+    return f"source {venv_dir}/bin/activate"
+
+
+def pin_requirements(packages: List[str], freeze_lines: List[str]) -> List[str]:
+    """Fixa as versões dos pacotes pedidos usando a saída do `pip freeze`."""
+    package_map = {requirement_name(p): p for p in freeze_lines if p}
+    requirements = []
+    for package in packages:
+        if requirement_name(package) in package_map:
+            requirements.append(package_map[requirement_name(package)])
+        else:
+            requirements.append(package)
+    return requirements
+
+
+def requirement_name(requirement: str) -> str:
+    """Nome normalizado (PEP 503) do projeto em uma linha de requisito."""
+    name = re.split(r"[\s\[=<>!~;@]", requirement.strip(), 1)[0]
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def pinned_version(requirement: str) -> Optional[str]:
+    """Versão exata (`==`) de uma linha de requisito sem marcadores, ou None."""
+    if any(c in requirement for c in ";@") or "==" not in requirement or "===" in requirement:
+        return None
+    version = requirement.split("==", 1)[1].strip()
+    return version if version and "*" not in version and "," not in version else None
+
+
+def update_requirements(venv_dir: str, freeze_lines: List[str]) -> Dict[str, str]:
+    """Atualiza no lugar as versões fixadas no requirements.txt do ambiente.
+
+    Cada linha cujo pacote aparece na saída do `pip freeze` passa a usar a
+    versão instalada; comentários e demais linhas são mantidos. Retorna as
+    linhas alteradas ({antiga: nova}).
+    """
+    requirements_file = os.path.join(venv_dir, REQUIREMENTS_FILE_NAME)
+    if not os.path.exists(requirements_file):
+        return {}
+    pins = {requirement_name(line): line for line in freeze_lines if "==" in line}
+    with open(requirements_file) as f:
+        lines = f.read().split("\n")
+
+    changed = {}
+    for index, line in enumerate(lines):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        pin = pins.get(requirement_name(line))
+        if pin and pin != line:
+            changed[line] = pin
+            lines[index] = pin
+
+    if changed:
+        with open(requirements_file, 'w') as f:
+            f.write("\n".join(lines))
+    return changed
+
+
+def write_requirements(venv_dir: str, requirements: List[str]) -> str:
+    """Escreve o requirements.txt do ambiente e retorna seu caminho."""
+    requirements_file = os.path.join(venv_dir, REQUIREMENTS_FILE_NAME)
+    with open(requirements_file, 'w') as f:
+        f.write("# Pacotes instalados durante a criação do ambiente virtual\n")
+        f.write("# Criado por fast-venv em " + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + "\n\n")
+        f.write('\n'.join(sorted(requirements)))
+    return requirements_file
+
+
+def write_metadata(venv_dir: str, python_inst: PythonInstallation,
+                   spans: Optional[List[Span]] = None, lock: Optional[dict] = None) -> str:
+    """Cria o arquivo de metadados do ambiente e retorna seu caminho.
+
+    `lock` registra os arquivos `-r`/`-c` usados (com sha256), os artefatos
+    baixados e as versões instaladas.
+    """
+    metadata = {
+        "created_at": datetime.now().isoformat(),
+        "python_version": python_inst.version,
+        "python_path": python_inst.executable,
+        "platform": platform.platform(),
+        "creator": "venv-manager",
+        "timings": [span.to_dict() for span in spans or []]
+    }
+    if lock is not None:
+        metadata["lock"] = lock
+
+    metadata_file = os.path.join(venv_dir, METADATA_FILE_NAME)
+    write_state(metadata_file, metadata, METADATA_SCHEMA_VERSION)
+    return metadata_file
+
+
+def update_metadata(venv_dir: str, **fields) -> bool:
+    """Atualiza campos do .venv-metadata.json; retorna False se ele não existir."""
+    metadata = read_metadata(venv_dir)
+    if metadata is None:
+        return False
+    metadata.update(fields)
+    write_state(os.path.join(venv_dir, METADATA_FILE_NAME), metadata, METADATA_SCHEMA_VERSION)
+    return True
+
+
+def read_metadata(venv_dir: str) -> Optional[dict]:
+    """Lê o .venv-metadata.json do ambiente, se existir e for válido."""
+    return read_state(os.path.join(venv_dir, METADATA_FILE_NAME), METADATA_SCHEMA_VERSION)
@@ -0,0 +1,171 @@
+# fast_venv/core/events.py
+"""Eventos estruturados emitidos pelo núcleo e sinks que os consomem.
+
+O núcleo (VenvManager, API assíncrona) nunca escreve no console: ele emite
+eventos para um `EventSink`. A interface rich é apenas um dos sinks
+(`fast_venv.ui.rich_sink.RichSink`); aqui ficam os sinks sem dependências.
+"""
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+from .registry import format_size
+from .timings import Timings
+
+# Tipos de evento
+PHASE_STARTED = "phase_started"        # phase, atributos da fase
+PHASE_FINISHED = "phase_finished"      # phase, wall, cpu, error (se houver)
+PROGRESS = "progress"                  # completed (0-100), description
+PACKAGE_INSTALLED = "package_installed"  # package
+PACKAGE_FAILED = "package_failed"      # package, returncode, log, tail
+COMMAND_FAILED = "command_failed"      # cmd, returncode, log, tail
+MESSAGE = "message"                    # level (info/success/warning/error), text
+VENV_CREATED = "venv_created"          # venv_dir, python, installed, failed, ...
+TIMINGS = "timings"                    # spans
+ACTIVATION = "activation"              # venv_dir, command
+INSTALLATIONS = "installations"        # installations, unhealthy (listas de dicts)
+ENVIRONMENTS = "environments"          # envs (lista de registros do registro)
+GC_REPORT = "gc_report"                # items, total, dry_run, failed
+UPGRADES = "upgrades"                  # package, results (um por ambiente)
+PREFETCH = "prefetch"                  # results (um por versão menor de Python)
+
+
+def format_startup(inst: dict) -> str:
+    """Sufixo com a latência de inicialização medida, se houver."""
+    startup_ms = inst.get("startup_ms")
+    return f" ({startup_ms:.0f} ms)" if startup_ms is not None else ""
+
+
+class Event:
+    def __init__(self, kind: str, data: Optional[dict] = None):
+        self.kind = kind
+        self.data = data or {}
+        self.time = time.time()
+
+    def to_dict(self) -> dict:
+        return {"event": self.kind, "time": self.time, **self.data}
+
+
+class EventSink:
+    """Destino dos eventos do núcleo. Subclasses implementam `handle`."""
+
+    def handle(self, event: Event):
+        raise NotImplementedError
+
+    def emit(self, kind: str, **data):
+        self.handle(Event(kind, data))
+
+    def message(self, text: str, level: str = "info"):
+        self.emit(MESSAGE, level=level, text=text)
+
+
+class NullSink(EventSink):
+    """Descarta todos os eventos (uso como biblioteca)."""
+
+    def handle(self, event: Event):
+        pass
+
+
+class JsonSink(EventSink):
+    """Escreve cada evento como uma linha JSON."""
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.stream = stream or sys.stdout
+
+    def handle(self, event: Event):
+        self.stream.write(json.dumps(event.to_dict(), default=str) + "\n")
+        self.stream.flush()
+
+
+class TextSink(EventSink):
+    """Texto simples, uma linha por evento relevante (logs de CI sem TTY)."""
+
+    _PREFIXES = {"success": "ok: ", "warning": "aviso: ", "error": "erro: ", "info": ""}
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.stream = stream or sys.stdout
+
+    def _write(self, line: str):
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def handle(self, event: Event):
+        data = event.data
+        if event.kind == PHASE_STARTED:
+            self._write(f"==> {data['phase']}")
+        elif event.kind == PHASE_FINISHED:
+            status = f" falhou ({data['error']})" if data.get("error") else ""
+            self._write(f"<== {data['phase']} {data['wall']:.3f}s{status}")
+        elif event.kind == PACKAGE_INSTALLED:
+            where = f" ({data['venv_dir']})" if data.get("venv_dir") else ""
+            self._write(f"  + {data['package']}{where}")
+        elif event.kind in (PACKAGE_FAILED, COMMAND_FAILED):
+            name = data.get("package") or " ".join(data.get("cmd", []))
+            if data.get("venv_dir"):
+                name += f" ({data['venv_dir']})"
+            self._write(f"  ! {name}: código {data['returncode']} (log: {data['log']})")
+            for line in data.get("tail", []):
+                self._write(f"    | {line}")
+        elif event.kind == MESSAGE:
+            self._write(self._PREFIXES.get(data["level"], "") + data["text"])
+        elif event.kind == TIMINGS:
+            for span in data["spans"]:
+                self._write(f"{span['name']:14} {span['wall']:9.3f}s wall "
+                            f"{span['cpu']:9.3f}s cpu  {span['attrs']}")
+        elif event.kind == ACTIVATION:
+            self._write(f"Para ativar: {data['command']}")
+        elif event.kind == INSTALLATIONS:
+            for inst in data["installations"]:
+                self._write(f"Python {inst['version']} - {inst['executable']}"
+                            f"{format_startup(inst)}")
+            for inst in data.get("unhealthy", []):
+                self._write(f"Ignorado: Python {inst['version']} - {inst['executable']} "
+                            f"({', '.join(inst['problems'])})")
+        elif event.kind == ENVIRONMENTS:
+            for env in data["envs"]:
+                last_used = time.strftime("%Y-%m-%d %H:%M", time.localtime(env["last_used"]))
+                self._write(f"{env['path']}  Python {env['python_version']}  "
+                            f"{format_size(env['size'])}  {last_used}")
+        elif event.kind == GC_REPORT:
+            for item in data["items"]:
+                self._write(f"{item['path']}  {item['reason']}  {format_size(item['size'])}")
+            verb = "seriam liberados" if data["dry_run"] else "liberados"
+            self._write(f"Total: {format_size(data['total'])} {verb} "
+                        f"({len(data['items'])} itens)")
+            for item in data.get("failed", []):
+                self._write(f"erro: não foi possível remover {item['path']} ({item['error']})")
+        elif event.kind == UPGRADES:
+            for result in data["results"]:
+                if result.get("skipped"):
+                    status = f"pulado ({result['skipped']})"
+                elif result["error"]:
+                    status = f"falhou (log: {result['error']['log']})"
+                else:
+                    status = f"{result['old_version'] or '?'} -> {result['new_version']}"
+                self._write(f"{result['venv_dir']}  {data['package']}  {status}")
+        elif event.kind == PREFETCH:
+            for result in data["results"]:
+                self._write(f"Python {result['python_version']}: "
+                            f"{len(result['cached'])} no cache, {len(result['failed'])} falharam")
+                for package, log in result["failed"].items():
+                    self._write(f"  ! {package} (log: {log})")
+
+
+@contextmanager
+def phase(sink: EventSink, timings: Timings, name: str, **attrs) -> Iterator[dict]:
+    """Mede uma fase como span e emite seus eventos de início e fim."""
+    sink.emit(PHASE_STARTED, phase=name, **attrs)
+    error = None
+    try:
+        with timings.span(name, **attrs) as span_attrs:
+            yield span_attrs
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        span = timings.spans[-1]
+        data = {**span.attrs, "phase": name, "wall": span.wall, "cpu": span.cpu,
+                "error": error}
+        sink.emit(PHASE_FINISHED, **data)
@@ -0,0 +1,288 @@
+# fast_venv/core/lockfile.py
+"""Arquivos de requisitos (`-r`) e restrições (`-c`), inclusive com `--hash`.
+
+Requisitos fixados com `==` e com hashes são baixados antes da instalação, em
+paralelo e com um número limitado de conexões, direto do índice (API JSON da
+PEP 691). O sha256 é verificado enquanto o arquivo é transmitido e os artefatos
+vão para o cache de wheels, de onde o pip instala sem acessar a rede. O que não
+puder ser baixado assim fica a cargo do próprio pip.
+"""
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urljoin
+
+from ..config import WHEEL_CACHE_DIR
+from .environment import pinned_version, requirement_name
+
+DEFAULT_INDEX_URL = "https://pypi.org/simple"
+SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+
+# Conexões simultâneas ao índice
+FETCH_WORKERS = 8
+FETCH_TIMEOUT = 60
+CHUNK_SIZE = 1 << 16
+
+_TAGS_SCRIPT = ("import json; from pip._vendor.packaging import tags; "
+                "print(json.dumps([str(t) for t in tags.sys_tags()]))")
+
+
+class FetchError(Exception):
+    """Falha ao baixar ou verificar um artefato."""
+
+
+class Requirement:
+    """Uma linha de requisito, com as opções `--hash` que a acompanham."""
+
+    def __init__(self, line: str, source: str):
+        tokens = line.replace("--hash ", "--hash=").split()
+        self.hashes = [t.split("=", 1)[1] for t in tokens if t.startswith("--hash=")]
+        self.spec = " ".join(t for t in tokens if not t.startswith("--"))
+        self.source = source
+        self.name = requirement_name(self.spec)
+
+    @property
+    def pinned_version(self) -> Optional[str]:
+        """Versão exata (`==`) sem marcadores, ou None."""
+        return pinned_version(self.spec)
+
+    @property
+    def sha256(self) -> List[str]:
+        return [h.split(":", 1)[1] for h in self.hashes if h.startswith("sha256:")]
+
+
+class RequirementsSet:
+    """Conteúdo de um ou mais arquivos `-r`/`-c`, com inclusões resolvidas."""
+
+    def __init__(self):
+        self.requirements: List[Requirement] = []
+        self.constraints: List[Requirement] = []
+        self.index_url: Optional[str] = None
+        self.find_links: List[str] = []
+        self.files: Dict[str, str] = {}  # caminho -> sha256 do conteúdo
+
+    def read(self, path: str, constraint: bool = False):
+        """Lê `path`, seguindo `-r`/`-c` aninhados relativos ao arquivo."""
+        path = os.path.abspath(path)
+        if path in self.files:
+            return
+        with open(path, "rb") as f:
+            content = f.read()
+        self.files[path] = hashlib.sha256(content).hexdigest()
+        base = os.path.dirname(path)
+
+        for line in _logical_lines(content.decode("utf-8")):
+            option, _, value = line.partition(" ")
+            value = value.strip()
+            if "=" in option and option.startswith("--"):
+                option, value = option.split("=", 1)
+            if option in ("-r", "--requirement"):
+                self.read(os.path.join(base, value), constraint)
+            elif option in ("-c", "--constraint"):
+                self.read(os.path.join(base, value), True)
+            elif option in ("-i", "--index-url"):
+                self.index_url = value
+            elif option in ("-f", "--find-links"):
+                self.find_links.append(value)
+            elif line.startswith("-"):
+                continue  # outras opções globais ficam a cargo do pip
+            else:
+                (self.constraints if constraint else self.requirements).append(
+                    Requirement(line, path))
+
+    @property
+    def names(self) -> List[str]:
+        return [req.name for req in self.requirements]
+
+
+def _logical_lines(text: str) -> List[str]:
+    """Junta continuações com `\\` e remove comentários e linhas vazias."""
+    lines, current = [], ""
+    for raw in text.splitlines():
+        raw = raw.split(" #", 1)[0] if not raw.lstrip().startswith("#") else ""
+        if raw.rstrip().endswith("\\"):
+            current += raw.rstrip()[:-1] + " "
+            continue
+        current += raw
+        if current.strip():
+            lines.append(" ".join(current.split()))
+        current = ""
+    if current.strip():
+        lines.append(" ".join(current.split()))
+    return lines
+
+
+def interpreter_tags(python: str) -> List[str]:
+    """Tags de compatibilidade suportadas por `python`, da mais à menos preferida."""
+    try:
+        result = subprocess.run([python, "-c", _TAGS_SCRIPT], capture_output=True,
+                                text=True, timeout=60)
+        return json.loads(result.stdout) if result.returncode == 0 else []
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        return []
+
+
+def _wheel_tags(filename: str) -> List[str]:
+    parts = filename[:-len(".whl")].split("-")
+    if len(parts) < 5:
+        return []
+    pythons, abis, platforms = parts[-3:]
+    return [f"{py}-{abi}-{plat}" for py in pythons.split(".")
+            for abi in abis.split(".") for plat in platforms.split(".")]
+
+
+class Artifact:
+    """Um arquivo escolhido no índice para um requisito fixado."""
+
+    def __init__(self, requirement: Requirement, filename: str, url: str, sha256: str):
+        self.requirement = requirement
+        self.filename = filename
+        self.url = url
+        self.sha256 = sha256
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.requirement.name,
+            "version": self.requirement.pinned_version,
+            "filename": self.filename,
+            "sha256": self.sha256
+        }
+
+
+def _select(requirement: Requirement, files: List[dict], tags: List[str]) -> Optional[Artifact]:
+    """Escolhe o arquivo com hash permitido mais compatível com `tags`."""
+    allowed = set(requirement.sha256)
+    rank = {tag: index for index, tag in enumerate(tags)}
+    best, best_rank = None, None
+    for info in files:
+        sha256 = info.get("hashes", {}).get("sha256")
+        if sha256 not in allowed or info.get("yanked"):
+            continue
+        filename = info["filename"]
+        if filename.endswith(".whl"):
+            ranks = [rank[t] for t in _wheel_tags(filename) if t in rank]
+            if not ranks:
+                continue
+            file_rank = min(ranks)
+        else:
+            file_rank = len(rank)  # sdist: só se não houver wheel compatível
+        if best_rank is None or file_rank < best_rank:
+            best = Artifact(requirement, filename, info["url"], sha256)
+            best_rank = file_rank
+    return best
+
+
+def _project_files(index_url: str, name: str) -> List[dict]:
+    url = f"{index_url.rstrip('/')}/{name}/"
+    request = urllib.request.Request(url, headers={"Accept": SIMPLE_JSON})
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+        if SIMPLE_JSON not in response.headers.get("Content-Type", ""):
+            raise FetchError(f"{url}: o índice não oferece a API JSON (PEP 691)")
+        data = json.load(response)
+    return [dict(info, url=urljoin(url, info["url"])) for info in data.get("files", [])]
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _download(artifact: Artifact, cache_dir: str) -> str:
+    """Baixa o artefato verificando o sha256 durante a transmissão."""
+    target = os.path.join(cache_dir, artifact.filename)
+    if os.path.exists(target) and _file_sha256(target) == artifact.sha256:
+        return target
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix="." + artifact.filename + ".",
+                                    suffix=".tmp")
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as out, \
+                urllib.request.urlopen(artifact.url, timeout=FETCH_TIMEOUT) as response:
+            for chunk in iter(lambda: response.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                out.write(chunk)
+        if digest.hexdigest() != artifact.sha256:
+            raise FetchError(f"{artifact.filename}: sha256 {digest.hexdigest()} "
+                             f"não confere com {artifact.sha256}")
+        os.replace(tmp_path, target)
+        return target
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def configured_index_url(python: str) -> Optional[str]:
+    """`index-url` dos arquivos de configuração do pip de `python`, se houver.
+
+    Lê `pip config list`, que considera pip.conf, PIP_CONFIG_FILE etc.;
+    `install.index-url` tem precedência sobre `global.index-url`.
+    """
+    try:
+        result = subprocess.run([python, "-m", "pip", "config", "list"],
+                                capture_output=True, text=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    values = {}
+    for line in result.stdout.splitlines():
+        key, sep, value = line.partition("=")
+        if sep and key in ("install.index-url", "global.index-url"):
+            values[key] = value.strip().strip("'\"")
+    return values.get("install.index-url") or values.get("global.index-url")
+
+
+def fetch_artifacts(requirements: Sequence[Requirement], tags: List[str],
+                    index_url: Optional[str] = None, workers: int = FETCH_WORKERS,
+                    cache_dir: str = WHEEL_CACHE_DIR, python: Optional[str] = None):
+    """Baixa em paralelo os artefatos dos requisitos fixados com hash.
+
+    Sem `index_url`, usa o mesmo índice que o pip usaria: PIP_INDEX_URL, a
+    configuração do pip de `python` (se dado) ou o PyPI. O chamador deve
+    manter o lock do cache (`locked(cache_dir, shared=True)`) até instalar os
+    artefatos, para que o `gc` não os remova antes. Retorna `(artefatos
+    baixados, {requisito: motivo})` para os que ficaram de fora e serão
+    resolvidos pelo pip.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    skipped: Dict[str, str] = {}
+    candidates = []
+    for req in requirements:
+        if req.pinned_version is None or not req.sha256:
+            skipped[req.spec] = "sem versão exata e hash sha256"
+        else:
+            candidates.append(req)
+    if not candidates:
+        return [], skipped
+    index_url = (index_url or os.environ.get("PIP_INDEX_URL")
+                 or (configured_index_url(python) if python else None) or DEFAULT_INDEX_URL)
+
+    def fetch(req: Requirement) -> Artifact:
+        try:
+            artifact = _select(req, _project_files(index_url, req.name), tags)
+        except (OSError, ValueError) as e:
+            raise FetchError(f"{req.name}: {e}")
+        if artifact is None:
+            raise FetchError(f"{req.name}: nenhum arquivo compatível com os hashes")
+        try:
+            _download(artifact, cache_dir)
+        except OSError as e:
+            raise FetchError(f"{artifact.filename}: {e}")
+        return artifact
+
+    fetched = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {req.spec: pool.submit(fetch, req) for req in candidates}
+        for spec, future in futures.items():
+            try:
+                fetched.append(future.result())
+            except FetchError as e:
+                skipped[spec] = str(e)
+    return fetched, skipped
@@ -0,0 +1,347 @@
+# fast_venv/core/pack.py
+"""Empacotamento de ambientes prontos para distribuir a outras máquinas.
+
+`pack_env` grava o ambiente em um tar transmitido direto para o compressor
+(zstd com várias threads quando o pacote opcional `zstandard` está instalado,
+gzip caso contrário). Arquivos idênticos são gravados uma única vez; as cópias
+viram hardlinks no tar. O primeiro membro é um manifesto com o caminho e o
+interpretador originais, que `unpack_env` usa para escolher o interpretador do
+destino e reescrever os caminhos do ambiente.
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import tarfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import zstandard
+except ImportError:  # dependência opcional: pip install fvenv[zstd]
+    zstandard = None
+
+from .discovery import PROBE_TIMEOUT, parse_version_output
+from .environment import read_metadata, update_metadata
+from .process import LOG_DIR_NAME
+from .python_installation import PythonInstallation
+from .relocate import relocate, set_interpreter
+from .slim import plan_slim
+
+MANIFEST_NAME = ".fvenv-pack.json"
+PACK_FORMAT = 1
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_LEVEL = 3
+HASH_CHUNK = 1 << 20
+
+# Links do interpretador base, que apontam para fora do ambiente
+INTERPRETER_LINK = re.compile(r"bin/python[0-9.]*")
+
+
+class PackError(Exception):
+    """Erro ao empacotar ou desempacotar um ambiente."""
+
+
+def default_archive_name(venv_dir: str) -> str:
+    """Nome padrão do pacote: `<ambiente>.tar.zst` (ou `.tar.gz` sem zstandard)."""
+    name = os.path.basename(os.path.abspath(venv_dir))
+    return name + (".tar.zst" if zstandard is not None else ".tar.gz")
+
+
+def _compression(path: str) -> Optional[str]:
+    """Compressão indicada pela extensão do arquivo: "zstd", "gzip" ou None."""
+    if path.endswith((".zst", ".zstd")):
+        return "zstd"
+    if path.endswith((".gz", ".tgz")):
+        return "gzip"
+    return None
+
+
+@contextmanager
+def _compressed_writer(path: str, compression: Optional[str],
+                       level: Optional[int]) -> Iterator[io.RawIOBase]:
+    """Abre `path` para escrita com a compressão dada."""
+    with open(path, "wb") as raw:
+        if compression == "zstd":
+            if zstandard is None:
+                raise PackError("Compressão zstd requer o pacote 'zstandard' "
+                                "(pip install zstandard); use a extensão .tar.gz")
+            compressor = zstandard.ZstdCompressor(level=level or ZSTD_LEVEL, threads=-1)
+            with compressor.stream_writer(raw, closefd=False) as writer:
+                yield writer
+        elif compression == "gzip":
+            with gzip.GzipFile(fileobj=raw, mode="wb",
+                               compresslevel=level or 6) as writer:
+                yield writer
+        else:
+            yield raw
+
+
+@contextmanager
+def _compressed_reader(path: str) -> Iterator[io.RawIOBase]:
+    """Abre `path` para leitura detectando a compressão pelo conteúdo."""
+    with open(path, "rb") as raw:
+        magic = raw.read(4)
+        raw.seek(0)
+        if magic.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise PackError("Este pacote usa zstd; instale o pacote 'zstandard'")
+            with zstandard.ZstdDecompressor().stream_reader(raw, closefd=False) as reader:
+                yield reader
+        elif magic.startswith(GZIP_MAGIC):
+            with gzip.GzipFile(fileobj=raw, mode="rb") as reader:
+                yield reader
+        else:
+            yield raw
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _walk(venv_dir: str, skip: Sequence[str]) -> List[Tuple[str, str]]:
+    """(caminho, nome no tar) de tudo o que será empacotado, em ordem estável."""
+    entries = []
+    for root, dirs, files in os.walk(venv_dir):
+        if root == venv_dir:
+            dirs[:] = [d for d in dirs if d != LOG_DIR_NAME]
+        dirs.sort()
+        for name in dirs + sorted(files):
+            path = os.path.join(root, name)
+            if path not in skip:
+                entries.append((path, os.path.relpath(path, venv_dir)))
+    return entries
+
+
+def _duplicates(entries: List[Tuple[str, str]]) -> Dict[str, str]:
+    """Hash dos arquivos que têm tamanho igual ao de outro (candidatos a duplicata)."""
+    by_size: Dict[int, List[str]] = {}
+    for path, _ in entries:
+        if os.path.isfile(path) and not os.path.islink(path):
+            size = os.path.getsize(path)
+            if size:
+                by_size.setdefault(size, []).append(path)
+    return {path: _file_digest(path)
+            for paths in by_size.values() if len(paths) > 1 for path in paths}
+
+
+def pack_env(venv_dir: str, output: str, slim: bool = False,
+             level: Optional[int] = None) -> dict:
+    """Empacota `venv_dir` em `output` e retorna um resumo do pacote.
+
+    Com `slim`, o pacote omite o que `slim_env` removeria, sem alterar o
+    ambiente de origem.
+    """
+    venv_dir = os.path.abspath(venv_dir)
+    if not os.path.isfile(os.path.join(venv_dir, "pyvenv.cfg")):
+        raise PackError(f"{venv_dir} não é um ambiente virtual")
+    metadata = read_metadata(venv_dir) or {}
+
+    plan = plan_slim(venv_dir) if slim else None
+    entries = _walk(venv_dir, plan.removed if plan else ())
+    digests = _duplicates(entries)
+
+    manifest = {
+        "format": PACK_FORMAT,
+        "original_path": venv_dir,
+        "python_version": metadata.get("python_version"),
+        "python_path": metadata.get("python_path"),
+        "platform": platform.platform(),
+        "created_at": time.time(),
+        "slim": plan.report.to_dict() if plan else None
+    }
+
+    summary = {"archive": output, "files": 0, "deduplicated": 0, "bytes_in": 0}
+    tmp_path = output + ".tmp"
+    try:
+        with _compressed_writer(tmp_path, _compression(output), level) as stream, \
+                tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+            data = json.dumps(manifest, indent=4).encode()
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(data)
+            info.mtime = int(manifest["created_at"])
+            tar.addfile(info, io.BytesIO(data))
+
+            first_by_digest: Dict[str, str] = {}
+            for path, arcname in entries:
+                info = tar.gettarinfo(path, arcname)
+                if info.isreg():
+                    digest = None if plan and path in plan.records else digests.get(path)
+                    if digest in first_by_digest:
+                        info.type = tarfile.LNKTYPE
+                        info.linkname = first_by_digest[digest]
+                        info.size = 0
+                        tar.addfile(info)
+                        summary["deduplicated"] += 1
+                        continue
+                    if digest:
+                        first_by_digest[digest] = arcname
+                    if plan and path in plan.records:
+                        content = plan.records[path]
+                        info.size = len(content)
+                        tar.addfile(info, io.BytesIO(content))
+                    else:
+                        with open(path, "rb") as f:
+                            tar.addfile(info, f)
+                    summary["files"] += 1
+                    summary["bytes_in"] += info.size
+                else:
+                    tar.addfile(info)
+        os.replace(tmp_path, output)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    summary["bytes_out"] = os.path.getsize(output)
+    summary["slim"] = manifest["slim"]
+    return summary
+
+
+def _probe_version(python: str) -> Optional[str]:
+    try:
+        result = subprocess.run([python, "--version"], capture_output=True, text=True,
+                                timeout=PROBE_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return parse_version_output(result.stdout, result.stderr)
+
+
+def _minor(version: str) -> str:
+    return ".".join(version.split(".")[:2])
+
+
+def choose_interpreter(python_version: Optional[str], python_path: Optional[str],
+                       find_installations: Optional[Callable[[], Sequence[PythonInstallation]]] = None,
+                       override: Optional[str] = None) -> PythonInstallation:
+    """Escolhe o interpretador do destino para um ambiente de `python_version`.
+
+    `override` pode ser um caminho ou uma versão (ex.: "3.11") e precisa ser
+    da mesma versão menor. Sem ele, usa o `python_path` original se existir;
+    senão, a instalação da mesma versão menor (a de versão idêntica, se
+    houver) entre as devolvidas por `find_installations`, chamada só nesse
+    caso. Levanta `PackError` se nenhuma servir.
+    """
+    wanted = _minor(python_version) if python_version else None
+    if override and os.path.sep not in override and re.fullmatch(r"\d+(\.\d+)*", override):
+        if wanted is not None and _minor(override) != wanted:
+            raise PackError(f"O ambiente foi criado com Python {python_version}, "
+                            f"não {override}")
+        wanted = wanted or _minor(override)
+        python_version = python_version or override
+    elif override:
+        if not os.path.exists(override):
+            raise PackError(f"{override} não encontrado")
+        version = _probe_version(override)
+        if version and (wanted is None or _minor(version) == wanted):
+            return PythonInstallation(version, os.path.abspath(override))
+        raise PackError(f"{override} é Python {version}, mas o ambiente "
+                        f"foi criado com Python {python_version}")
+    elif python_path and os.path.exists(python_path):
+        version = _probe_version(python_path)
+        if version and (wanted is None or _minor(version) == wanted):
+            return PythonInstallation(version, os.path.abspath(python_path))
+    if wanted is None:
+        raise PackError("O pacote não informa a versão do Python; use --python")
+    installations = find_installations() if find_installations else []
+    matches = [inst for inst in installations if _minor(inst.version) == wanted]
+    if not matches:
+        raise PackError(f"Nenhum Python {wanted} encontrado para o ambiente")
+    exact = [inst for inst in matches if inst.version == python_version]
+    return (exact or matches)[0]
+
+
+def _inside(path: str, root: str) -> bool:
+    return os.path.commonpath([os.path.realpath(path), root]) == root
+
+
+def _check_member(member: tarfile.TarInfo, target_dir: str):
+    """Valida um membro quando o tarfile não tem filtros de extração (Python antigo).
+
+    Equivale ao filtro 'tar': recusa nomes absolutos ou que saiam de
+    `target_dir` (inclusive através de links já extraídos) e arquivos
+    especiais, e remove setuid/setgid e a escrita de grupo/outros. Recusa
+    também links para fora do destino, exceto os `bin/python*`, que
+    `set_interpreter` refaz logo depois. Levanta `PackError`.
+    """
+    root = os.path.realpath(target_dir)
+    if os.path.isabs(member.name) or not _inside(os.path.join(root, member.name), root):
+        raise PackError(f"Pacote inválido: {member.name} fica fora do destino")
+    if member.isdev():
+        raise PackError(f"Pacote inválido: {member.name} é um arquivo especial")
+    if member.islnk() or member.issym():
+        base = os.path.join(root, os.path.dirname(member.name)) if member.issym() else root
+        target = os.path.join(base, member.linkname)
+        if (os.path.isabs(member.linkname) or not _inside(target, root)) and \
+                not (member.issym() and INTERPRETER_LINK.fullmatch(member.name)):
+            raise PackError(f"Pacote inválido: {member.name} aponta para fora do destino "
+                            f"({member.linkname})")
+    member.mode &= 0o755
+
+
+def _extract(tar: tarfile.TarFile, member: tarfile.TarInfo, target_dir: str):
+    """Extrai `member` com o filtro 'tar' ou, sem ele, com `_check_member`."""
+    if hasattr(tarfile, "tar_filter"):
+        tar.extract(member, target_dir, filter="tar")
+    else:
+        _check_member(member, target_dir)
+        tar.extract(member, target_dir)
+
+
+def unpack_env(archive: str, target_dir: str,
+               find_installations: Optional[Callable[[], Sequence[PythonInstallation]]] = None,
+               python: Optional[str] = None) -> Tuple[PythonInstallation, dict]:
+    """Desempacota `archive` em `target_dir` e ajusta o ambiente ao novo lugar.
+
+    Retorna o interpretador usado e o manifesto do pacote. Em caso de erro o
+    diretório parcial é removido.
+    """
+    target_dir = os.path.abspath(target_dir)
+    if os.path.exists(target_dir) and os.listdir(target_dir):
+        raise PackError(f"{target_dir} já existe e não está vazio")
+
+    created = not os.path.exists(target_dir)
+    try:
+        with _compressed_reader(archive) as stream, \
+                tarfile.open(fileobj=stream, mode="r|") as tar:
+            first = tar.next()
+            if first is None or first.name != MANIFEST_NAME:
+                raise PackError(f"{archive} não é um pacote do fvenv")
+            manifest = json.load(tar.extractfile(first))
+            if manifest.get("format", 0) > PACK_FORMAT:
+                raise PackError("Pacote criado por uma versão mais nova do fvenv")
+
+            # Verificar o interpretador antes de extrair qualquer coisa
+            python_inst = choose_interpreter(manifest.get("python_version"),
+                                             manifest.get("python_path"),
+                                             find_installations, python)
+            os.makedirs(target_dir, exist_ok=True)
+            for member in tar:
+                # A iteração recomeça do primeiro membro, o manifesto já lido
+                if member.name != MANIFEST_NAME:
+                    _extract(tar, member, target_dir)
+
+        relocate(target_dir, manifest["original_path"])
+        set_interpreter(target_dir, python_inst.executable)
+
+        update_metadata(target_dir, python_version=python_inst.version,
+                        python_path=python_inst.executable)
+    except BaseException:
+        shutil.rmtree(target_dir, ignore_errors=True)
+        if not created:
+            os.makedirs(target_dir, exist_ok=True)
+        raise
+
+    return python_inst, manifest
@@ -1,40 +1,158 @@
 # fast_venv/core/package_manager.py
-import json
-import os
-from typing import Dict, List
-from ..config import FAVORITE_PACKAGES_FILE
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+from ..config import (FAVORITE_PACKAGES_FILE, PACKAGE_SCORE_HALF_LIFE_DAYS,
+                      POPULAR_PACKAGES_TOP_K)
+from .state import locked, read_state, write_state
+
+# Versão do esquema de favorite_packages.json
+FAVORITES_SCHEMA_VERSION = 1
+
+# Chave do ranking global (todas as versões do Python)
+ALL_VERSIONS = "*"
+
+# Expoente máximo (base 2) antes de renormalizar os scores armazenados
+_MAX_SCORE_EXPONENT = 512
+
 
 class PackageManager:
+    """Rastreia o uso de pacotes com scores que decaem exponencialmente.
+
+    Os scores usam decaimento "forward": cada uso soma 2^((t - epoch) / meia-vida)
+    e o valor atual é obtido multiplicando por 2^(-(agora - epoch) / meia-vida).
+    Como o fator é o mesmo para todos os pacotes, a ordem relativa não muda com o
+    tempo e o top-k de cada versão pode ser mantido incrementalmente em um heap.
+    """
+
     def __init__(self):
-        self.favorite_packages = self.load_favorite_packages()
+        self.half_life = PACKAGE_SCORE_HALF_LIFE_DAYS * 86400
+        self.top_k = POPULAR_PACKAGES_TOP_K
+        self.epoch = time.time()
+        self.favorite_packages: Dict[str, int] = {}
+        self.scores: Dict[str, Dict[str, float]] = {}
+        self._top: Dict[str, List[Tuple[float, str]]] = {}
+        self.load_favorite_packages()
 
     def load_favorite_packages(self) -> Dict[str, int]:
         """Carrega pacotes favoritos do arquivo."""
-        if os.path.exists(FAVORITE_PACKAGES_FILE):
-            try:
-                with open(FAVORITE_PACKAGES_FILE, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                return {}
-        return {}
+        data = read_state(FAVORITE_PACKAGES_FILE, FAVORITES_SCHEMA_VERSION) or {}
+        self._apply_data(data)
+        return self.favorite_packages
+
+    def _apply_data(self, data: dict):
+        """Preenche contadores, scores e índices a partir dos dados do arquivo."""
+        if "scores" in data:
+            self.epoch = data.get("epoch", time.time())
+            self.favorite_packages = dict(data.get("counts", {}))
+            self.scores = {version: dict(scores)
+                           for version, scores in data["scores"].items()}
+        else:
+            # Formato antigo: {pacote: contagem}, tratado como uso recente
+            self.epoch = time.time()
+            self.favorite_packages = {k: v for k, v in data.items()
+                                      if isinstance(v, int)}
+            self.scores = {ALL_VERSIONS: {k: float(v)
+                                          for k, v in self.favorite_packages.items()}}
+        self._rebuild_top()
+
+    def _rebuild_top(self):
+        """Reconstrói os heaps top-k de todas as versões."""
+        self._top = {
+            version: heapq.nlargest(self.top_k, ((s, p) for p, s in scores.items()))
+            for version, scores in self.scores.items()
+        }
+        for heap in self._top.values():
+            heapq.heapify(heap)
 
     def save_favorite_packages(self):
         """Salva pacotes favoritos no arquivo."""
-        with open(FAVORITE_PACKAGES_FILE, 'w') as f:
-            json.dump(self.favorite_packages, f, indent=4)
+        with locked(FAVORITE_PACKAGES_FILE):
+            self._write()
+
+    def _write(self):
+        """Escreve o estado atual; deve ser chamado com o lock do arquivo."""
+        data = {
+            "epoch": self.epoch,
+            "counts": self.favorite_packages,
+            "scores": self.scores
+        }
+        write_state(FAVORITE_PACKAGES_FILE, data, FAVORITES_SCHEMA_VERSION)
+
+    @staticmethod
+    def _version_key(python_version: Optional[str]) -> str:
+        """Normaliza a versão do Python para 'major.minor'."""
+        if not python_version:
+            return ALL_VERSIONS
+        return ".".join(str(python_version).split(".")[:2])
+
+    def _weight(self, now: float) -> float:
+        """Peso de um uso no instante `now` relativo à época dos scores."""
+        exponent = (now - self.epoch) / self.half_life
+        if exponent > _MAX_SCORE_EXPONENT:
+            self._renormalize(now)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _renormalize(self, now: float):
+        """Move a época para `now`, reescalando todos os scores armazenados."""
+        factor = 2.0 ** (-(now - self.epoch) / self.half_life)
+        for scores in self.scores.values():
+            for package in scores:
+                scores[package] *= factor
+        self.epoch = now
+        self._rebuild_top()
+
+    def _bump(self, version: str, package: str, weight: float):
+        """Soma `weight` ao score do pacote e atualiza o heap top-k da versão."""
+        scores = self.scores.setdefault(version, {})
+        score = scores.get(package, 0.0) + weight
+        scores[package] = score
+
+        heap = self._top.setdefault(version, [])
+        for idx, (_, name) in enumerate(heap):
+            if name == package:
+                heap[idx] = (score, package)
+                heapq.heapify(heap)
+                return
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, (score, package))
+        elif score > heap[0][0]:
+            heapq.heapreplace(heap, (score, package))
+
+    def add_package_usage(self, package: str, python_version: Optional[str] = None):
+        """Registra um uso do pacote, opcionalmente para uma versão do Python."""
+        with locked(FAVORITE_PACKAGES_FILE):
+            # Recarrega para não perder usos gravados por outros processos
+            self.load_favorite_packages()
+            weight = self._weight(time.time())
+            self.favorite_packages[package] = self.favorite_packages.get(package, 0) + 1
+            self._bump(ALL_VERSIONS, package, weight)
+            version = self._version_key(python_version)
+            if version != ALL_VERSIONS:
+                self._bump(version, package, weight)
+            self._write()
 
-    def add_package_usage(self, package: str):
-        """Incrementa o contador de uso de um pacote."""
-        self.favorite_packages[package] = self.favorite_packages.get(package, 0) + 1
-        self.save_favorite_packages()
+    def get_popular_packages(self, limit: int = 5,
+                             python_version: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Retorna os pacotes mais relevantes com seus scores atuais.
 
-    def get_popular_packages(self, limit: int = 5) -> List[str]:
-        """Retorna os pacotes mais populares."""
-        return sorted(self.favorite_packages.items(), 
-                     key=lambda x: x[1], 
-                     reverse=True)[:limit]
+        Com `python_version`, usa o ranking daquela versão (major.minor) e recorre
+        ao ranking global se ainda não houver histórico para ela. O resultado é
+        limitado a `POPULAR_PACKAGES_TOP_K` itens.
+        """
+        heap = self._top.get(self._version_key(python_version))
+        if not heap:
+            heap = self._top.get(ALL_VERSIONS, [])
+        decay = 2.0 ** (-(time.time() - self.epoch) / self.half_life)
+        return [(package, score * decay)
+                for score, package in sorted(heap, reverse=True)[:limit]]
 
     def clear_package_history(self):
         """Limpa o histórico de pacotes."""
-        self.favorite_packages = {}
-        self.save_favorite_packages()
\ No newline at end of file
+        with locked(FAVORITE_PACKAGES_FILE):
+            self.epoch = time.time()
+            self.favorite_packages = {}
+            self.scores = {}
+            self._top = {}
+            self._write()
@@ -0,0 +1,125 @@
+# fast_venv/core/prefetch.py
+"""Pré-download dos pacotes mais usados para o cache local de wheels.
+
+Para cada versão menor de Python descoberta, os pacotes mais populares naquela
+versão (segundo o `PackageManager`) são construídos como wheels no cache, de
+modo que o próximo `create_venv` os instale sem acessar a rede.
+"""
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence
+
+from ..config import LOGS_DIR, PREFETCH_TOP_K, WHEEL_CACHE_DIR
+from .events import EventSink, NullSink, phase
+from .package_manager import PackageManager
+from .process import CommandError
+from .python_installation import PythonInstallation
+from .timings import Timings
+from .wheel_cache import build_wheels, download
+
+# Log da execução em segundo plano
+PREFETCH_LOG = os.path.join(LOGS_DIR, "prefetch.log")
+
+
+class PrefetchResult:
+    """Pacotes colocados (ou não) no cache para uma versão menor de Python."""
+
+    def __init__(self, python_version: str, executable: str):
+        self.python_version = python_version
+        self.executable = executable
+        self.cached: List[str] = []
+        self.failed: Dict[str, str] = {}  # pacote -> log
+
+    def to_dict(self) -> dict:
+        return {
+            "python_version": self.python_version,
+            "executable": self.executable,
+            "cached": self.cached,
+            "failed": self.failed
+        }
+
+
+def _has_pip(python: str) -> bool:
+    try:
+        return subprocess.run([python, "-m", "pip", "--version"], stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL, timeout=30).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+def _version_key(inst: PythonInstallation) -> tuple:
+    return tuple(int(part) for part in re.findall(r"\d+", inst.version)[:3])
+
+
+def _by_minor_version(installations: Sequence[PythonInstallation]) -> List[PythonInstallation]:
+    """Uma instalação por versão menor (a mais recente de cada uma)."""
+    chosen: Dict[str, PythonInstallation] = {}
+    for inst in installations:
+        key = f"{inst.major_version}.{inst.minor_version}"
+        current = chosen.get(key)
+        if current is None or _version_key(inst) > _version_key(current):
+            chosen[key] = inst
+    return list(chosen.values())
+
+
+def prefetch(installations: Sequence[PythonInstallation], limit: int = PREFETCH_TOP_K,
+             index_args: Sequence[str] = (), package_manager: Optional[PackageManager] = None,
+             sink: Optional[EventSink] = None,
+             cache_dir: str = WHEEL_CACHE_DIR) -> List[PrefetchResult]:
+    """Coloca no cache os `limit` pacotes mais populares de cada versão menor.
+
+    Usa `pip wheel` com o próprio interpretador quando ele tem pip; caso
+    contrário, baixa apenas wheels binárias compatíveis com o pip deste
+    processo (`--python-version X.Y --only-binary=:all:`). `index_args` é
+    repassado ao pip (ex.: `--index-url`, `--find-links`).
+    """
+    package_manager = package_manager or PackageManager()
+    sink = sink or NullSink()
+    timings = Timings()
+    results = []
+
+    for inst in _by_minor_version(installations):
+        minor = f"{inst.major_version}.{inst.minor_version}"
+        result = PrefetchResult(minor, inst.executable)
+        results.append(result)
+        packages = [name for name, _ in package_manager.get_popular_packages(limit, minor)]
+        if not packages:
+            continue
+
+        native = _has_pip(inst.executable)
+        for package in packages:
+            try:
+                with phase(sink, timings, "prefetch", package=package, python=minor):
+                    if native:
+                        build_wheels(inst.executable, [package], index_args, cache_dir)
+                    else:
+                        download(sys.executable, [package],
+                                 ["--python-version", minor, "--only-binary=:all:",
+                                  *index_args], cache_dir)
+                result.cached.append(package)
+            except CommandError as e:
+                result.failed[package] = e.log_path
+
+    return results
+
+
+def spawn_background(args: Sequence[str]) -> int:
+    """Reexecuta `fvenv prefetch` desacoplado do terminal e com prioridade baixa.
+
+    Retorna o PID do processo; a saída vai para `PREFETCH_LOG`.
+    """
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    cmd = [sys.executable, "-m", "fast_venv.cli", "prefetch", *args]
+    with open(PREFETCH_LOG, "a") as log:
+        if os.name == "nt":
+            flags = (subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+                     | subprocess.IDLE_PRIORITY_CLASS)
+            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=log,
+                                    stderr=subprocess.STDOUT, creationflags=flags)
+        else:
+            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=log,
+                                    stderr=subprocess.STDOUT, start_new_session=True,
+                                    preexec_fn=lambda: os.nice(19))
+    return proc.pid
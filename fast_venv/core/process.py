@@ -0,0 +1,198 @@
+# fast_venv/core/process.py
+"""Execução de subprocessos com saída transmitida linha a linha para um log."""
+import asyncio
+import os
+import re
+import subprocess
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+# Diretório de logs dentro de cada ambiente virtual
+LOG_DIR_NAME = ".fvenv-logs"
+
+# Quantidade de linhas finais mantidas em memória para relatórios de erro
+TAIL_LINES = 30
+
+
+# Observadores de subprocessos (ex.: o perfilador): recebem tipo, comando e segundos
+_observers: List[Callable[[str, List[str], float], None]] = []
+
+
+def add_observer(observer: Callable[[str, List[str], float], None]):
+    _observers.append(observer)
+
+
+def remove_observer(observer: Callable[[str, List[str], float], None]):
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def command_kind(cmd: List[str]) -> str:
+    """Classifica um comando: "probe", "venv", "pip install", "freeze", "pip <cmd>" ou "other"."""
+    args = list(cmd[1:])
+    if args == ["--version"]:
+        return "probe"
+    if args[:2] == ["-m", "venv"]:
+        return "venv"
+    if args[:2] == ["-m", "pip"]:
+        args = args[2:]
+    elif not os.path.basename(cmd[0]).lower().startswith("pip"):
+        return "other"
+    sub = next((arg for arg in args if not arg.startswith("-")), None)
+    if sub is None:
+        return "probe" if "--version" in args else "pip"
+    return "freeze" if sub == "freeze" else f"pip {sub}"
+
+
+@contextmanager
+def observed(cmd: List[str], kind: Optional[str] = None) -> Iterator[None]:
+    """Mede o tempo de relógio do subprocesso `cmd` para os observadores.
+
+    `kind` substitui a classificação automática de `command_kind`.
+    """
+    if not _observers:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        kind = kind or command_kind(cmd)
+        for observer in list(_observers):
+            observer(kind, cmd, elapsed)
+
+
+class CommandError(subprocess.CalledProcessError):
+    """Falha de um comando executado com `run_logged`, com o final do log."""
+
+    def __init__(self, returncode: int, cmd: List[str], log_path: str, tail: List[str]):
+        super().__init__(returncode, cmd, output="\n".join(tail))
+        self.log_path = log_path
+        self.tail = tail
+
+    def __str__(self) -> str:
+        return f"{super().__str__()} Log: {self.log_path}"
+
+
+def log_name(name: str) -> str:
+    """Nome seguro para um arquivo de log derivado de `name` (ex.: um pacote)."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name)
+
+
+def run_logged(cmd: List[str], log_path: str,
+               on_line: Optional[Callable[[str], None]] = None,
+               env: Optional[dict] = None) -> None:
+    """Executa `cmd` anexando stdout/stderr a `log_path` conforme são produzidos.
+
+    `on_line` recebe cada linha (sem a quebra final). Se o comando terminar com
+    código diferente de zero, levanta `CommandError` com as últimas linhas.
+    """
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    tail = deque(maxlen=TAIL_LINES)
+    with open(log_path, "a", encoding="utf-8") as log:
+        log.write("$ " + subprocess.list2cmdline(cmd) + "\n")
+        log.flush()
+        with observed(cmd):
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1,
+                env=env
+            )
+            try:
+                for line in proc.stdout:
+                    log.write(line)
+                    line = line.rstrip("\r\n")
+                    tail.append(line)
+                    if on_line:
+                        on_line(line)
+                returncode = proc.wait()
+            except BaseException:
+                proc.kill()
+                proc.wait()
+                raise
+            finally:
+                proc.stdout.close()
+        log.write(f"[código de saída: {returncode}]\n")
+
+    if returncode != 0:
+        raise CommandError(returncode, cmd, log_path, list(tail))
+
+
+async def async_run_logged(cmd: List[str], log_path: str,
+                           on_line: Optional[Callable[[str], None]] = None,
+                           env: Optional[dict] = None) -> None:
+    """Versão assíncrona de `run_logged`.
+
+    Se a tarefa for cancelada, o subprocesso é encerrado antes de propagar
+    o `CancelledError`.
+    """
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    tail = deque(maxlen=TAIL_LINES)
+    with open(log_path, "a", encoding="utf-8") as log:
+        log.write("$ " + subprocess.list2cmdline(cmd) + "\n")
+        log.flush()
+        with observed(cmd):
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                env=env,
+                limit=2 ** 20
+            )
+            try:
+                while True:
+                    raw = await proc.stdout.readline()
+                    if not raw:
+                        break
+                    line = raw.decode("utf-8", errors="replace")
+                    log.write(line)
+                    line = line.rstrip("\r\n")
+                    tail.append(line)
+                    if on_line:
+                        on_line(line)
+                returncode = await proc.wait()
+            except BaseException:
+                if proc.returncode is None:
+                    proc.kill()
+                    await asyncio.shield(proc.wait())
+                raise
+        log.write(f"[código de saída: {returncode}]\n")
+
+    if returncode != 0:
+        raise CommandError(returncode, cmd, log_path, list(tail))
+
+
+class PipProgress:
+    """Interpreta incrementalmente a saída do `pip install`.
+
+    `fraction` estima o avanço da instalação (0 a 1) e `status` descreve a
+    etapa atual, para alimentar barras de progresso.
+    """
+
+    _PHASES = [
+        (re.compile(r"^\s*(Collecting|Looking in|Processing|Requirement already satisfied)"), 0.1),
+        (re.compile(r"^\s*(Downloading|Using cached|Obtaining)"), 0.3),
+        (re.compile(r"^\s*(Building wheel|Building wheels|Preparing metadata|Installing build dependencies|Getting requirements)"), 0.5),
+        (re.compile(r"^\s*(Installing collected packages|Attempting uninstall)"), 0.8),
+        (re.compile(r"^\s*Successfully installed"), 1.0),
+    ]
+
+    def __init__(self):
+        self.fraction = 0.0
+        self.status = ""
+
+    def feed(self, line: str) -> bool:
+        """Processa uma linha; retorna True se o estado mudou."""
+        for pattern, fraction in self._PHASES:
+            if pattern.match(line):
+                self.fraction = max(self.fraction, fraction)
+                self.status = line.strip()[:80]
+                return True
+        return False
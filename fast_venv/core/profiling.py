@@ -0,0 +1,173 @@
+# fast_venv/core/profiling.py
+"""Perfilamento de uma execução do fvenv (`--profile` ou FVENV_PROFILE).
+
+Dois modos:
+- "cprofile": cProfile na thread principal, gravado em `.pstats`, mais o
+  amostrador abaixo;
+- "wall": só o amostrador, com custo menor; mede tempo de relógio, inclusive
+  o tempo parado esperando subprocessos.
+
+O amostrador lê as pilhas de todas as threads periodicamente e grava um
+arquivo no formato "collapsed" (uma pilha por linha seguida da contagem), que
+flamegraph.pl, speedscope e inferno leem. O tempo de relógio dos subprocessos
+(probe, venv, pip install, freeze...) é somado por tipo.
+"""
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..config import LOGS_DIR
+from . import process
+
+PROFILE_ENV_VAR = "FVENV_PROFILE"
+PROFILE_MODES = ("cprofile", "wall")
+PROFILES_DIR = os.path.join(LOGS_DIR, "profiles")
+
+# Intervalo entre amostras das pilhas (segundos)
+SAMPLE_INTERVAL = 0.01
+
+
+def parse_profile_flag(argv: List[str]) -> tuple:
+    """Remove `--profile[=modo]` de `argv`; retorna (modo ou None, argv restante).
+
+    Sem a flag, usa FVENV_PROFILE ("1" equivale a "cprofile"; "0" ou vazio desliga).
+    Levanta `ValueError` para um modo desconhecido.
+    """
+    mode, rest = None, []
+    for arg in argv:
+        if arg == "--profile":
+            mode = "cprofile"
+        elif arg.startswith("--profile="):
+            mode = arg.split("=", 1)[1] or "cprofile"
+        else:
+            rest.append(arg)
+    if mode is None:
+        value = os.environ.get(PROFILE_ENV_VAR, "").strip().lower()
+        if value and value != "0":
+            mode = "cprofile" if value == "1" else value
+    if mode is not None and mode not in PROFILE_MODES:
+        raise ValueError(f"Modo de perfil inválido: {mode} (use {' ou '.join(PROFILE_MODES)})")
+    return mode, rest
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _Sampler(threading.Thread):
+    """Amostra as pilhas de todas as threads e conta as pilhas iguais."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="fvenv-profiler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class ChildStats:
+    """Tempo de relógio dos subprocessos agrupado por tipo."""
+
+    def __init__(self):
+        self.by_kind: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, kind: str, cmd: List[str], seconds: float):
+        with self._lock:
+            stats = self.by_kind.setdefault(kind, {"count": 0, "total": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+
+    def to_dict(self) -> dict:
+        return {kind: {"count": int(stats["count"]), "total": round(stats["total"], 6),
+                       "max": round(stats["max"], 6)}
+                for kind, stats in sorted(self.by_kind.items(),
+                                          key=lambda item: -item[1]["total"])}
+
+
+class Profiler:
+    """Perfila o processo entre `start()` e `stop()` e grava os resultados."""
+
+    def __init__(self, mode: str = "cprofile", output_dir: str = PROFILES_DIR):
+        self.mode = mode
+        self.output_dir = output_dir
+        self.children = ChildStats()
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_Sampler] = None
+        self._start = 0.0
+        self.wall = 0.0
+
+    def start(self):
+        self._start = time.perf_counter()
+        process.add_observer(self.children)
+        self._sampler = _Sampler()
+        self._sampler.start()
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self) -> Dict[str, str]:
+        """Encerra a coleta e grava os arquivos; retorna {tipo: caminho}."""
+        if self._profile is not None:
+            self._profile.disable()
+        self._sampler.stop()
+        process.remove_observer(self.children)
+        self.wall = time.perf_counter() - self._start
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(self.output_dir, f"fvenv-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+                                               f"-{os.getpid()}")
+        paths = {}
+        if self._profile is not None:
+            paths["pstats"] = prefix + ".pstats"
+            self._profile.dump_stats(paths["pstats"])
+
+        paths["collapsed"] = prefix + ".collapsed"
+        with open(paths["collapsed"], "w") as f:
+            for stack, count in sorted(self._sampler.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+        paths["summary"] = prefix + ".json"
+        with open(paths["summary"], "w") as f:
+            json.dump({
+                "mode": self.mode,
+                "argv": sys.argv,
+                "wall": round(self.wall, 6),
+                "samples": sum(self._sampler.stacks.values()),
+                "sample_interval": SAMPLE_INTERVAL,
+                "children": self.children.to_dict()
+            }, f, indent=4)
+        return paths
+
+    def report(self, paths: Dict[str, str]) -> str:
+        """Resumo legível: tempo total, subprocessos por tipo e arquivos gravados."""
+        lines = [f"Perfil ({self.mode}): {self.wall:.2f}s no total"]
+        for kind, stats in self.children.to_dict().items():
+            lines.append(f"  {kind}: {stats['count']}x, {stats['total']:.2f}s "
+                         f"(máx. {stats['max']:.2f}s)")
+        lines.extend(f"  {path}" for path in paths.values())
+        return "\n".join(lines)
@@ -1,17 +1,61 @@
 # fast_venv/core/python_installation.py
+from typing import List, Optional
+
+from ..config import MIN_PYTHON_VERSION, SLOW_STARTUP_MS
+
+
 class PythonInstallation:
-    def __init__(self, version: str, executable: str):
+    def __init__(self, version: str, executable: str,
+                 startup_ms: Optional[float] = None, venv_ok: Optional[bool] = None,
+                 ensurepip_ok: Optional[bool] = None, signature: Optional[list] = None,
+                 checked_at: float = 0.0):
         self.version = version
         self.executable = executable
         self.major_version = int(version.split('.')[0])
         self.minor_version = int(version.split('.')[1])
+        # Saúde (None = não verificado): latência de `--version` e módulos venv/ensurepip
+        self.startup_ms = startup_ms
+        self.venv_ok = venv_ok
+        self.ensurepip_ok = ensurepip_ok
+        self.signature = signature or []
+        self.checked_at = checked_at
+
+    @property
+    def supported(self) -> bool:
+        return (self.major_version, self.minor_version) >= MIN_PYTHON_VERSION
+
+    @property
+    def problems(self) -> List[str]:
+        """Motivos para não usar o interpretador (vazio se estiver saudável)."""
+        problems = []
+        if not self.supported:
+            problems.append(f"versão menor que {'.'.join(map(str, MIN_PYTHON_VERSION))}")
+        if self.venv_ok is False:
+            problems.append("módulo venv quebrado")
+        if self.ensurepip_ok is False:
+            problems.append("sem ensurepip")
+        if self.startup_ms is not None and self.startup_ms > SLOW_STARTUP_MS:
+            problems.append(f"lento ({self.startup_ms:.0f} ms)")
+        return problems
+
+    @property
+    def healthy(self) -> bool:
+        return not self.problems
 
     def to_dict(self) -> dict:
         return {
             "version": self.version,
-            "executable": self.executable
+            "executable": self.executable,
+            "startup_ms": self.startup_ms,
+            "venv_ok": self.venv_ok,
+            "ensurepip_ok": self.ensurepip_ok,
+            "signature": self.signature,
+            "checked_at": self.checked_at,
+            "problems": self.problems
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'PythonInstallation':
-        return cls(data["version"], data["executable"])
\ No newline at end of file
+        return cls(data["version"], data["executable"], data.get("startup_ms"),
+                   data.get("venv_ok"), data.get("ensurepip_ok"), data.get("signature"),
+                   data.get("checked_at", 0.0))
@@ -0,0 +1,232 @@
+# fast_venv/core/registry.py
+"""Registro central dos ambientes criados pelo fvenv.
+
+O registro (`REGISTRY_FILE`) guarda, para cada ambiente, o caminho, o
+interpretador, um fingerprint dos pacotes instalados, o tamanho em disco e o
+último uso. Listar não percorre os ambientes: para cada um basta comparar uma
+assinatura barata (mtimes de poucos diretórios) e só os ambientes alterados têm
+tamanho e fingerprint recalculados. Ambientes apagados são descobertos e
+removidos do registro na próxima listagem.
+"""
+import glob
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from ..config import REGISTRY_FILE
+from .python_installation import PythonInstallation
+from .state import read_state, update_state
+
+REGISTRY_SCHEMA_VERSION = 1
+
+# Threads usadas para verificar ambientes em paralelo
+REFRESH_WORKERS = 16
+
+
+def format_size(size: int) -> str:
+    """Formata um tamanho em bytes de forma legível."""
+    units = ["B", "KB", "MB", "GB", "TB"]
+    value = float(size)
+    index = 0
+    while value >= 1024 and index < len(units) - 1:
+        value /= 1024
+        index += 1
+    if index == 0:
+        return f"{size} B"
+    return f"{value:.1f} {units[index]}"
+
+
+def dir_size(path: str) -> int:
+    """Soma o tamanho dos arquivos sob `path`, sem seguir links simbólicos."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def site_packages_dirs(venv_dir: str) -> List[str]:
+    """Diretórios site-packages do ambiente (POSIX e Windows)."""
+    return (glob.glob(os.path.join(venv_dir, "lib", "python*", "site-packages"))
+            + glob.glob(os.path.join(venv_dir, "Lib", "site-packages")))
+
+
+def env_signature(venv_dir: str) -> Optional[List[int]]:
+    """Assinatura barata do ambiente ou None se ele não existir mais.
+
+    Usa o mtime dos diretórios que mudam quando pacotes são instalados ou
+    removidos (site-packages, bin/Scripts) e do pyvenv.cfg.
+    """
+    paths = [venv_dir, os.path.join(venv_dir, "pyvenv.cfg"),
+             os.path.join(venv_dir, "Scripts" if os.name == "nt" else "bin")]
+    paths.extend(site_packages_dirs(venv_dir))
+    signature = []
+    for path in paths:
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            if path == venv_dir:
+                return None
+            signature.append(0)
+    return signature
+
+
+def env_fingerprint(venv_dir: str) -> str:
+    """Hash do pyvenv.cfg e das distribuições instaladas (nome e versão)."""
+    digest = hashlib.sha256()
+    try:
+        with open(os.path.join(venv_dir, "pyvenv.cfg"), "rb") as f:
+            digest.update(f.read())
+    except OSError:
+        pass
+    for site_packages in site_packages_dirs(venv_dir):
+        try:
+            names = sorted(n for n in os.listdir(site_packages) if n.endswith(".dist-info"))
+        except OSError:
+            continue
+        digest.update("\n".join(names).encode())
+    return digest.hexdigest()[:16]
+
+
+def _last_access(venv_dir: str) -> float:
+    """Último acesso ao pyvenv.cfg, lido pelo interpretador a cada execução.
+
+    Em sistemas montados com `noatime` o valor não muda; por isso é só um dos
+    indícios de uso (ver `EnvRecord.refresh`).
+    """
+    try:
+        return os.stat(os.path.join(venv_dir, "pyvenv.cfg")).st_atime
+    except OSError:
+        return 0.0
+
+
+class EnvRecord:
+    def __init__(self, path: str, python_version: str, python_path: str,
+                 fingerprint: str = "", size: int = 0, last_used: float = 0.0,
+                 created_at: float = 0.0, signature: Optional[List[int]] = None):
+        self.path = path
+        self.python_version = python_version
+        self.python_path = python_path
+        self.fingerprint = fingerprint
+        self.size = size
+        self.last_used = last_used
+        self.created_at = created_at
+        self.signature = signature or []
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "python_version": self.python_version,
+            "python_path": self.python_path,
+            "fingerprint": self.fingerprint,
+            "size": self.size,
+            "last_used": self.last_used,
+            "created_at": self.created_at,
+            "signature": self.signature
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'EnvRecord':
+        return cls(data["path"], data.get("python_version", ""), data.get("python_path", ""),
+                   data.get("fingerprint", ""), data.get("size", 0), data.get("last_used", 0.0),
+                   data.get("created_at", 0.0), data.get("signature"))
+
+    def refresh(self) -> bool:
+        """Atualiza o registro a partir do disco; retorna False se o ambiente sumiu."""
+        signature = env_signature(self.path)
+        if signature is None:
+            return False
+        # Ler o atime antes do fingerprint, que lê o pyvenv.cfg e o atualizaria
+        last_access = _last_access(self.path)
+        if signature != self.signature:
+            self.size = dir_size(self.path)
+            self.fingerprint = env_fingerprint(self.path)
+            self.signature = signature
+        # Indícios de uso: comandos do fvenv (`touch`), atime do pyvenv.cfg e
+        # mtimes da assinatura (instalação ou remoção de pacotes)
+        self.last_used = max(self.last_used, last_access, max(signature) / 1e9)
+        return True
+
+
+class EnvRegistry:
+    """Acesso ao registro de ambientes em `REGISTRY_FILE`."""
+
+    def __init__(self, path: str = REGISTRY_FILE):
+        self.path = path
+
+    def _update(self):
+        return update_state(self.path, REGISTRY_SCHEMA_VERSION, default={"envs": {}})
+
+    def load(self) -> Dict[str, EnvRecord]:
+        """Lê o registro sem consultar o disco dos ambientes."""
+        data = read_state(self.path, REGISTRY_SCHEMA_VERSION) or {}
+        return {path: EnvRecord.from_dict(record)
+                for path, record in data.get("envs", {}).items()}
+
+    def register(self, venv_dir: str, python_inst: PythonInstallation) -> EnvRecord:
+        """Adiciona (ou substitui) um ambiente recém-criado no registro."""
+        path = os.path.abspath(venv_dir)
+        now = time.time()
+        record = EnvRecord(path, python_inst.version, python_inst.executable,
+                           created_at=now, last_used=now)
+        record.refresh()
+        with self._update() as data:
+            data["envs"][path] = record.to_dict()
+        return record
+
+    def touch(self, *venv_dirs: str):
+        """Marca ambientes registrados como usados agora.
+
+        Chamado pelos comandos que usam um ambiente existente (upgrade, clone,
+        pack), para que o `gc` não dependa só do atime.
+        """
+        now = time.time()
+        with self._update() as data:
+            for venv_dir in venv_dirs:
+                path = os.path.abspath(venv_dir)
+                if path in data["envs"]:
+                    data["envs"][path]["last_used"] = now
+
+    def unregister(self, *venv_dirs: str):
+        """Remove ambientes do registro."""
+        with self._update() as data:
+            for venv_dir in venv_dirs:
+                data["envs"].pop(os.path.abspath(venv_dir), None)
+
+    def refresh(self) -> List[EnvRecord]:
+        """Revalida todos os ambientes e devolve os que ainda existem.
+
+        Só os ambientes cuja assinatura mudou têm o tamanho recalculado; os que
+        não existem mais são removidos do registro. O disco é percorrido sem o
+        lock do registro, que só é mantido para juntar os resultados: entradas
+        registradas, removidas ou recriadas por outro processo nesse meio tempo
+        são preservadas, assim como um `last_used` mais recente.
+        """
+        records = list(self.load().values())
+        with ThreadPoolExecutor(max_workers=REFRESH_WORKERS) as pool:
+            alive = list(pool.map(EnvRecord.refresh, records))
+
+        with self._update() as data:
+            for record, ok in zip(records, alive):
+                current = data["envs"].get(record.path)
+                if current is None or current.get("created_at", 0.0) != record.created_at:
+                    continue  # removido ou recriado enquanto o disco era lido
+                if ok:
+                    record.last_used = max(record.last_used, current.get("last_used", 0.0))
+                    data["envs"][record.path] = record.to_dict()
+                else:
+                    del data["envs"][record.path]
+        return [record for record, ok in zip(records, alive) if ok]
@@ -0,0 +1,151 @@
+# fast_venv/core/relocate.py
+"""Ajuste dos caminhos absolutos gravados em um ambiente virtual.
+
+Um venv guarda o próprio caminho em `pyvenv.cfg`, nos scripts de ativação e
+nos shebangs de `bin/`. Para mudar o ambiente de lugar, todos os arquivos de
+texto são percorridos uma única vez, substituindo o prefixo antigo pelo novo;
+arquivos binários são pulados após uma leitura rápida do início.
+"""
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from .process import LOG_DIR_NAME
+
+# Bytes lidos para decidir se um arquivo é binário
+SNIFF_SIZE = 8192
+# Arquivos até este tamanho são lidos de uma vez; maiores são processados em blocos
+CHUNK_SIZE = 1 << 20
+
+
+def is_binary(path: str) -> bool:
+    """Heurística rápida: um byte NUL no início indica arquivo binário."""
+    try:
+        with open(path, "rb") as f:
+            return b"\0" in f.read(SNIFF_SIZE)
+    except OSError:
+        return True
+
+
+def _replace_file(path: str, write):
+    """Grava um arquivo novo ao lado de `path` e o substitui, mantendo o modo.
+
+    A substituição desfaz hardlinks, então cópias com links não se afetam.
+    """
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix="." + os.path.basename(path) + ".",
+                                    suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            write(out)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def rewrite_prefix(path: str, old: bytes, new: bytes) -> bool:
+    """Substitui `old` por `new` em `path`; retorna True se o arquivo mudou."""
+    if os.path.getsize(path) <= CHUNK_SIZE:
+        with open(path, "rb") as f:
+            data = f.read()
+        if old not in data:
+            return False
+        _replace_file(path, lambda out: out.write(data.replace(old, new)))
+        return True
+
+    changed = False
+
+    def stream(out):
+        nonlocal changed
+        carry = b""
+        with open(path, "rb") as src:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                data = carry + chunk
+                # Guarda o final do bloco: uma ocorrência pode continuar no próximo
+                cut = len(data) if not chunk else len(data) - (len(old) - 1)
+                pos = 0
+                while True:
+                    index = data.find(old, pos)
+                    if index == -1 or index >= cut:
+                        break
+                    out.write(data[pos:index])
+                    out.write(new)
+                    pos = index + len(old)
+                    changed = True
+                out.write(data[pos:max(pos, cut)])
+                carry = data[max(pos, cut):]
+                if not chunk:
+                    break
+
+    _replace_file(path, stream)
+    return changed
+
+
+def relocate(venv_dir: str, old_prefix: str, new_prefix: Optional[str] = None) -> int:
+    """Troca `old_prefix` por `new_prefix` (padrão: `venv_dir`) em todo o ambiente.
+
+    Reescreve arquivos de texto e links simbólicos que citam o prefixo antigo.
+    Retorna quantos arquivos foram alterados.
+    """
+    new_prefix = os.path.abspath(new_prefix or venv_dir)
+    old_prefix = os.path.abspath(old_prefix)
+    if old_prefix == new_prefix:
+        return 0
+    old, new = old_prefix.encode(), new_prefix.encode()
+    changed = 0
+
+    for root, dirs, files in os.walk(venv_dir):
+        dirs[:] = [d for d in dirs if d not in (LOG_DIR_NAME, "__pycache__")]
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.islink(path):
+                target = os.readlink(path)
+                if target.startswith(old_prefix):
+                    os.remove(path)
+                    os.symlink(new_prefix + target[len(old_prefix):], path)
+                    changed += 1
+                continue
+            if name.endswith((".pyc", ".so", ".dll", ".pyd", ".exe")) or is_binary(path):
+                continue
+            if rewrite_prefix(path, old, new):
+                changed += 1
+    return changed
+
+
+def bin_dir(venv_dir: str) -> str:
+    return os.path.join(venv_dir, "Scripts" if os.name == "nt" else "bin")
+
+
+def set_interpreter(venv_dir: str, python_executable: str):
+    """Aponta o ambiente para outro interpretador base (mesma versão menor).
+
+    Atualiza `home`/`executable` no `pyvenv.cfg` e, no POSIX, os links
+    `bin/python*` que apontavam para um caminho absoluto.
+    """
+    python_executable = os.path.abspath(python_executable)
+    cfg_path = os.path.join(venv_dir, "pyvenv.cfg")
+    with open(cfg_path) as f:
+        lines = f.read().splitlines()
+    values = {"home": os.path.dirname(python_executable),
+              "executable": os.path.realpath(python_executable)}
+    for index, line in enumerate(lines):
+        key = line.split("=", 1)[0].strip()
+        if key in values:
+            lines[index] = f"{key} = {values[key]}"
+    with open(cfg_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+    if os.name == "nt":
+        return
+    bin_path = bin_dir(venv_dir)
+    for name in os.listdir(bin_path):
+        path = os.path.join(bin_path, name)
+        if name.startswith("python") and os.path.islink(path) and \
+                os.path.isabs(os.readlink(path)):
+            os.remove(path)
+            os.symlink(python_executable, path)
@@ -0,0 +1,215 @@
+# fast_venv/core/slim.py
+"""Redução do tamanho de um ambiente virtual já instalado.
+
+Remove diretórios de testes dos pacotes, bytecode compilado para outras versões
+de Python, documentação listada nos `RECORD` das distribuições e caches do pip
+dentro do ambiente. Os `RECORD` são reescritos sem os arquivos removidos, para
+que `pip uninstall` e sincronizações posteriores continuem consistentes.
+"""
+import csv
+import io
+import os
+import subprocess
+from typing import Dict, Optional, Set
+
+from .environment import get_python_path
+from .registry import site_packages_dirs
+
+# Categorias de arquivos removidos
+TESTS = "tests"
+BYTECODE = "bytecode"
+DOCS = "docs"
+PIP_CACHE = "pip_cache"
+
+TEST_DIR_NAMES = {"tests", "test"}
+DOC_DIR_NAMES = {"doc", "docs"}
+DOC_SUFFIXES = (".rst", ".md", ".markdown")
+# Dentro de diretórios doc/docs, só estes arquivos contam como documentação
+DOC_DIR_SUFFIXES = DOC_SUFFIXES + (".txt", ".html", ".htm", ".css", ".js", ".png",
+                                   ".jpg", ".jpeg", ".gif", ".svg")
+# Código importável nunca é removido, mesmo em diretórios doc/docs
+CODE_SUFFIXES = (".py", ".pyi", ".pyc", ".so", ".pyd", ".dll")
+# Arquivos de licença são mantidos mesmo quando parecem documentação
+KEEP_PREFIXES = ("license", "licence", "copying", "notice", "authors")
+
+
+class SlimReport:
+    """Bytes e arquivos removidos por categoria."""
+
+    def __init__(self):
+        self.bytes_saved: Dict[str, int] = {}
+        self.files_removed: Dict[str, int] = {}
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.bytes_saved.values())
+
+    @property
+    def total_files(self) -> int:
+        return sum(self.files_removed.values())
+
+    def add(self, category: str, size: int):
+        self.bytes_saved[category] = self.bytes_saved.get(category, 0) + size
+        self.files_removed[category] = self.files_removed.get(category, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "bytes_saved": self.total_bytes,
+            "files_removed": self.total_files,
+            "by_category": {category: {"bytes": self.bytes_saved[category],
+                                       "files": self.files_removed[category]}
+                            for category in self.bytes_saved}
+        }
+
+
+def cache_tag(venv_dir: str) -> Optional[str]:
+    """`sys.implementation.cache_tag` do interpretador do ambiente (ex.: cpython-311)."""
+    try:
+        result = subprocess.run(
+            [get_python_path(venv_dir), "-c", "import sys; print(sys.implementation.cache_tag)"],
+            capture_output=True, text=True, timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def _is_doc(relative_path: str) -> bool:
+    parts = relative_path.replace("\\", "/").split("/")
+    if parts[0].endswith((".dist-info", ".egg-info")) or parts[0] == "..":
+        return False
+    name = parts[-1].lower()
+    if name.startswith(KEEP_PREFIXES) or name.endswith(CODE_SUFFIXES):
+        return False
+    if name.endswith(DOC_SUFFIXES):
+        return True
+    return name.endswith(DOC_DIR_SUFFIXES) and any(p.lower() in DOC_DIR_NAMES for p in parts[1:-1])
+
+
+def _candidates(site_packages: str, tag: Optional[str]) -> Dict[str, str]:
+    """Arquivos a remover em `site_packages` ({caminho absoluto: categoria})."""
+    selected: Dict[str, str] = {}
+    for root, dirs, files in os.walk(site_packages):
+        relative_root = os.path.relpath(root, site_packages)
+        depth = 0 if relative_root == "." else relative_root.count(os.sep) + 1
+        for name in list(dirs):
+            # Só subdiretórios de pacotes: um pacote de nível superior "test" é mantido
+            if depth >= 1 and name in TEST_DIR_NAMES:
+                for sub_root, _, sub_files in os.walk(os.path.join(root, name)):
+                    for sub_name in sub_files:
+                        selected[os.path.join(sub_root, sub_name)] = TESTS
+                dirs.remove(name)
+        if os.path.basename(root) == "__pycache__" and tag:
+            for name in files:
+                if name.endswith(".pyc") and f".{tag}." not in name:
+                    selected[os.path.join(root, name)] = BYTECODE
+    return selected
+
+
+def _record_docs(site_packages: str) -> Dict[str, str]:
+    """Documentação listada nos RECORD das distribuições."""
+    selected = {}
+    for dist_info in os.listdir(site_packages):
+        record = os.path.join(site_packages, dist_info, "RECORD")
+        if not dist_info.endswith(".dist-info") or not os.path.isfile(record):
+            continue
+        with open(record, newline="") as f:
+            for row in csv.reader(f):
+                if row and _is_doc(row[0]):
+                    selected[os.path.normpath(os.path.join(site_packages, row[0]))] = DOCS
+    return selected
+
+
+def _rewritten_records(site_packages: str, removed: Set[str]) -> Dict[str, bytes]:
+    """Novo conteúdo dos RECORD que citam arquivos removidos."""
+    records = {}
+    for dist_info in os.listdir(site_packages):
+        record = os.path.join(site_packages, dist_info, "RECORD")
+        if not dist_info.endswith(".dist-info") or not os.path.isfile(record):
+            continue
+        with open(record, newline="") as f:
+            rows = list(csv.reader(f))
+        kept = [row for row in rows if not row or
+                os.path.normpath(os.path.join(site_packages, row[0])) not in removed]
+        if len(kept) != len(rows):
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerows(kept)
+            records[record] = buffer.getvalue().encode("utf-8")
+    return records
+
+
+class SlimPlan:
+    """O que `slim_env` removeria, sem tocar no ambiente.
+
+    `removed` mapeia caminhos a categorias e `records` traz o novo conteúdo
+    dos RECORD afetados; o empacotamento usa o plano para omitir arquivos.
+    """
+
+    def __init__(self, venv_dir: str):
+        self.venv_dir = venv_dir
+        self.removed: Dict[str, str] = {}
+        self.records: Dict[str, bytes] = {}
+        self.report = SlimReport()
+
+
+def plan_slim(venv_dir: str) -> SlimPlan:
+    """Calcula os arquivos a remover de `venv_dir` e os RECORD reescritos."""
+    venv_dir = os.path.abspath(venv_dir)
+    plan = SlimPlan(venv_dir)
+    tag = cache_tag(venv_dir)
+
+    for site_packages in site_packages_dirs(venv_dir):
+        selected = _candidates(site_packages, tag)
+        for path, category in _record_docs(site_packages).items():
+            selected.setdefault(path, category)
+        for path, category in selected.items():
+            try:
+                plan.report.add(category, os.lstat(path).st_size)
+            except OSError:
+                continue
+            plan.removed[path] = category
+        plan.records.update(_rewritten_records(site_packages, set(plan.removed)))
+
+    # Caches do pip que tenham ido parar dentro do ambiente (ex.: PIP_CACHE_DIR relativo)
+    for cache_dir in (os.path.join(venv_dir, ".cache", "pip"), os.path.join(venv_dir, "pip-cache")):
+        for root, _, files in os.walk(cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    plan.report.add(PIP_CACHE, os.lstat(path).st_size)
+                except OSError:
+                    continue
+                plan.removed[path] = PIP_CACHE
+
+    return plan
+
+
+def _remove_empty_dirs(top: str, removed: Set[str]):
+    """Remove os diretórios que ficaram vazios, subindo até `top`."""
+    for directory in sorted({os.path.dirname(path) for path in removed},
+                            key=len, reverse=True):
+        while directory != top and directory.startswith(top):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+
+
+def slim_env(venv_dir: str) -> SlimReport:
+    """Reduz o ambiente em `venv_dir` e retorna quanto foi economizado."""
+    plan = plan_slim(venv_dir)
+    for path in plan.removed:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    for record, content in plan.records.items():
+        tmp_path = record + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, record)
+    _remove_empty_dirs(plan.venv_dir, set(plan.removed))
+    return plan.report
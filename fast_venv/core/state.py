@@ -0,0 +1,130 @@
+# fast_venv/core/state.py
+"""Leitura e escrita segura dos arquivos de estado JSON do fvenv.
+
+As escritas usam arquivo temporário + fsync + rename, então leitores nunca veem
+um arquivo truncado. Operações de leitura-modificação-escrita são serializadas
+entre processos com um lock consultivo em um arquivo `<alvo>.lock`.
+"""
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SCHEMA_KEY = "schema_version"
+
+
+@contextmanager
+def locked(path: str, shared: bool = False) -> Iterator[None]:
+    """Mantém um lock consultivo associado a `path`.
+
+    O lock é exclusivo, ou compartilhado com `shared` (vários leitores ao
+    mesmo tempo, nenhum exclusivo). No Windows é sempre exclusivo.
+    """
+    lock_path = path + ".lock"
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    with open(lock_path, "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write_json(path: str, data) -> None:
+    """Escreve `data` como JSON em `path` de forma atômica."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix="." + os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    _fsync_dir(directory)
+
+
+def _fsync_dir(directory: str):
+    """Garante que o rename foi persistido (apenas em sistemas POSIX)."""
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_state(path: str, schema_version: int,
+               migrate: Optional[Callable[[dict, int], dict]] = None) -> Optional[dict]:
+    """Lê um arquivo de estado versionado.
+
+    Retorna None se o arquivo não existir, estiver corrompido ou tiver sido
+    escrito por uma versão mais nova do esquema. Arquivos sem `schema_version`
+    são tratados como versão 0 e passam por `migrate`, se fornecido.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    version = data.pop(SCHEMA_KEY, 0)
+    if not isinstance(version, int) or version > schema_version:
+        return None
+    if version < schema_version and migrate is not None:
+        data = migrate(data, version)
+    return data
+
+
+def write_state(path: str, data: dict, schema_version: int) -> None:
+    """Escreve um arquivo de estado versionado de forma atômica."""
+    atomic_write_json(path, {SCHEMA_KEY: schema_version, **data})
+
+
+@contextmanager
+def update_state(path: str, schema_version: int, default: Optional[dict] = None,
+                 migrate: Optional[Callable[[dict, int], dict]] = None) -> Iterator[dict]:
+    """Lê, permite modificar e reescreve um arquivo de estado sob lock."""
+    with locked(path):
+        data = read_state(path, schema_version, migrate)
+        if data is None:
+            data = dict(default or {})
+        yield data
+        write_state(path, data, schema_version)
@@ -0,0 +1,89 @@
+# fast_venv/core/timings.py
+"""Medição de tempo por fase (spans) com saída opcional em JSONL.
+
+Cada span registra o tempo de relógio (wall) e o tempo de CPU, incluindo o CPU
+gasto pelos subprocessos finalizados durante o span (python -m venv, pip...).
+Se a variável de ambiente FVENV_TRACE apontar para um arquivo, cada span é
+anexado a ele como uma linha JSON.
+"""
+import json
+import os
+import socket
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+TRACE_ENV_VAR = "FVENV_TRACE"
+
+
+def _cpu_time() -> float:
+    """CPU do processo atual somado ao CPU dos filhos já finalizados."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class Span:
+    def __init__(self, name: str, start: float, wall: float, cpu: float,
+                 attrs: Optional[dict] = None):
+        self.name = name
+        self.start = start
+        self.wall = wall
+        self.cpu = cpu
+        self.attrs = attrs or {}
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "start": self.start,
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "attrs": self.attrs
+        }
+
+
+class Timings:
+    """Coleta spans nomeados de uma execução do fvenv."""
+
+    def __init__(self, trace_path: Optional[str] = None):
+        self.spans: List[Span] = []
+        self.run_id = uuid.uuid4().hex
+        self.trace_path = trace_path or os.environ.get(TRACE_ENV_VAR) or None
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[dict]:
+        """Mede o bloco como um span; o dict retornado aceita atributos extras."""
+        start = time.time()
+        wall0 = time.perf_counter()
+        cpu0 = _cpu_time()
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs["error"] = type(e).__name__
+            raise
+        finally:
+            span = Span(name, start, time.perf_counter() - wall0,
+                        _cpu_time() - cpu0, attrs)
+            self.spans.append(span)
+            self._trace(span)
+
+    def since(self, mark: int) -> List[Span]:
+        """Spans registrados a partir do índice `mark`."""
+        return self.spans[mark:]
+
+    def _trace(self, span: Span):
+        """Anexa o span ao arquivo de trace JSONL, se configurado."""
+        if not self.trace_path:
+            return
+        record = {
+            "run_id": self.run_id,
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            **span.to_dict()
+        }
+        try:
+            with open(self.trace_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            # Trace é auxiliar: nunca deve interromper a operação principal
+            pass
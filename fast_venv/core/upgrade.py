@@ -0,0 +1,178 @@
+# fast_venv/core/upgrade.py
+"""Atualização de um pacote em vários ambientes do fvenv de uma vez."""
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+
+from .cleanup import find_envs
+from .environment import get_python_path, read_metadata, requirement_name, update_requirements
+from .events import PACKAGE_FAILED, PACKAGE_INSTALLED, EventSink, NullSink
+from .process import LOG_DIR_NAME, CommandError, log_name, run_logged
+from .registry import EnvRegistry
+from .wheel_cache import download, install_args
+
+# Atualizações simultâneas padrão
+UPGRADE_WORKERS = 4
+
+
+class UpgradeResult:
+    """Resultado da atualização de um pacote em um ambiente."""
+
+    def __init__(self, venv_dir: str, package: str):
+        self.venv_dir = venv_dir
+        self.package = package
+        self.old_version: Optional[str] = None
+        self.new_version: Optional[str] = None
+        self.requirements_changed: Dict[str, str] = {}
+        self.error: Optional[CommandError] = None
+        # Motivo para não atualizar o ambiente (ex.: pacote não instalado nele)
+        self.skipped: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        return {
+            "venv_dir": self.venv_dir,
+            "package": self.package,
+            "old_version": self.old_version,
+            "new_version": self.new_version,
+            "requirements_changed": self.requirements_changed,
+            "skipped": self.skipped,
+            "error": None if self.error is None else {"returncode": self.error.returncode,
+                                                      "log": self.error.log_path}
+        }
+
+
+def managed_envs(venv_dirs: Iterable[str] = (), extra_roots: Iterable[str] = (),
+                 registry: Optional[EnvRegistry] = None) -> List[str]:
+    """Ambientes do fvenv (com metadados válidos) a atualizar.
+
+    Sem `venv_dirs`, usa todos os ambientes do registro e os encontrados sob
+    `extra_roots`.
+    """
+    paths = [os.path.abspath(path) for path in venv_dirs]
+    if not paths:
+        registry = registry or EnvRegistry()
+        paths = [record.path for record in registry.refresh()]
+        paths.extend(path for path in find_envs(extra_roots) if path not in paths)
+    return [path for path in paths if read_metadata(path) is not None]
+
+
+def _freeze(venv_dir: str) -> List[str]:
+    lines: List[str] = []
+    run_logged([get_python_path(venv_dir), "-m", "pip", "freeze"],
+               os.path.join(venv_dir, LOG_DIR_NAME, "freeze.log"), lines.append)
+    return lines
+
+
+def _version(freeze_lines: List[str], package: str) -> Optional[str]:
+    name = requirement_name(package)
+    for line in freeze_lines:
+        if "==" in line and requirement_name(line) == name:
+            return line.split("==", 1)[1]
+    return None
+
+
+def upgrade_env(venv_dir: str, package: str, from_cache: bool = True,
+                freeze: Optional[List[str]] = None) -> UpgradeResult:
+    """Atualiza `package` em um ambiente e ajusta as versões do requirements.txt.
+
+    Ambientes em que o pacote não está instalado são pulados (`skipped`).
+    `freeze` é a saída do `pip freeze` já obtida, se houver. Com `from_cache`,
+    instala a partir do cache de distribuições sem acessar o índice; se isso
+    falhar, tenta de novo com o índice configurado no pip.
+    """
+    result = UpgradeResult(venv_dir, package)
+    python = get_python_path(venv_dir)
+    log_path = os.path.join(venv_dir, LOG_DIR_NAME, f"upgrade-{log_name(package)}.log")
+    try:
+        if freeze is None:
+            freeze = _freeze(venv_dir)
+        result.old_version = _version(freeze, package)
+        if result.old_version is None:
+            result.skipped = "não instalado"
+            return result
+
+        installed = False
+        if from_cache:
+            try:
+                run_logged([python, "-m", "pip", *install_args(["--upgrade", package])],
+                           log_path)
+                installed = True
+            except CommandError:
+                pass
+        if not installed:
+            run_logged([python, "-m", "pip", "install", "--progress-bar", "off",
+                        "--upgrade", package], log_path)
+        freeze = _freeze(venv_dir)
+    except CommandError as e:
+        result.error = e
+        return result
+    result.new_version = _version(freeze, package)
+    result.requirements_changed = update_requirements(venv_dir, freeze)
+    return result
+
+
+def upgrade_package(package: str, venv_dirs: List[str], workers: int = UPGRADE_WORKERS,
+                    sink: Optional[EventSink] = None) -> List[UpgradeResult]:
+    """Atualiza `package` em vários ambientes em paralelo.
+
+    Ambientes sem o pacote instalado são pulados. Os ambientes são agrupados
+    por interpretador; para cada grupo o pacote e suas dependências são
+    baixados uma vez para o cache compartilhado, e cada ambiente instala a
+    partir dele. Os ambientes processados são marcados como usados no registro.
+    """
+    sink = sink or NullSink()
+
+    # Só os ambientes que já têm o pacote instalado são atualizados
+    def freeze_or_error(venv_dir: str):
+        try:
+            return _freeze(venv_dir)
+        except CommandError:
+            return None  # upgrade_env repete o freeze e registra o erro
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        freezes = dict(zip(venv_dirs, pool.map(freeze_or_error, venv_dirs)))
+
+    results = []
+    groups: Dict[tuple, List[str]] = {}
+    for venv_dir in venv_dirs:
+        freeze = freezes[venv_dir]
+        if freeze is not None and _version(freeze, package) is None:
+            result = UpgradeResult(venv_dir, package)
+            result.skipped = "não instalado"
+            results.append(result)
+            continue
+        metadata = read_metadata(venv_dir) or {}
+        key = (metadata.get("python_version"), metadata.get("python_path"))
+        groups.setdefault(key, []).append(venv_dir)
+
+    cached = set()
+    for key, members in groups.items():
+        try:
+            download(get_python_path(members[0]), [package])
+            cached.add(key)
+        except CommandError as e:
+            sink.message(f"Falha ao baixar {package} para Python {key[0]} "
+                         f"(log: {e.log_path}); usando o índice diretamente", "warning")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(upgrade_env, venv_dir, package, key in cached,
+                               freezes[venv_dir])
+                   for key, members in groups.items() for venv_dir in members]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result.skipped:
+                continue
+            if result.ok:
+                sink.emit(PACKAGE_INSTALLED, package=f"{package}=={result.new_version}",
+                          venv_dir=result.venv_dir)
+            else:
+                sink.emit(PACKAGE_FAILED, package=package, venv_dir=result.venv_dir,
+                          returncode=result.error.returncode, log=result.error.log_path,
+                          tail=result.error.tail)
+    EnvRegistry().touch(*(result.venv_dir for result in results if not result.skipped))
+    return results
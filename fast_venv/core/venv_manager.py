@@ -1,266 +1,419 @@
 # fast_venv/core/venv_manager.py
 import os
+import re
 import subprocess
-import json
-import glob
 import time
 import shutil
-from typing import List, Optional
-import platform
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from datetime import datetime
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Prompt
 
-from ..config import CACHE_FILE, DEFAULT_PACKAGES
-from ..ui.console import console
+from ..config import CACHE_FILE, DEFAULT_PACKAGES, LOGS_DIR, WHEEL_CACHE_DIR
 from .python_installation import PythonInstallation
 from .package_manager import PackageManager
+from .environment import (get_pip_path, get_python_path, pin_requirements, write_metadata,
+                          write_requirements)
+from .discovery import (PROBE_WORKERS, check_installations, interpreter_signature,
+                        iter_candidates, probe_interpreter)
+from .events import (COMMAND_FAILED, PACKAGE_FAILED, PACKAGE_INSTALLED, PROGRESS,
+                     VENV_CREATED, EventSink, NullSink, phase)
+from .lockfile import FetchError, RequirementsSet, fetch_artifacts, interpreter_tags
+from .registry import EnvRegistry, format_size
+from .process import LOG_DIR_NAME, CommandError, PipProgress, log_name, run_logged
+from .state import locked, read_state, write_state
+from .slim import slim_env
+from .timings import Span, Timings
+from .wheel_cache import artifact_version, cached_artifact, install_args, install_commands
+
+# Versão do esquema do cache de instalações (2: campos de saúde e lista `unhealthy`)
+CACHE_SCHEMA_VERSION = 2
 
 class VenvManager:
-    def __init__(self):
+    def __init__(self, sink: Optional[EventSink] = None):
+        # Sem sink, o gerenciador é silencioso (uso como biblioteca)
+        self.sink = sink or NullSink()
         self.installations: List[PythonInstallation] = []
+        # Interpretadores encontrados mas ignorados (versão antiga, venv quebrado, lentos)
+        self.unhealthy: List[PythonInstallation] = []
+        self._rejected: Dict[str, list] = {}
+        self.timings = Timings()
         self.package_manager = PackageManager()
+        self.registry = EnvRegistry()
         self.load_installations()
 
     def load_installations(self):
         """Carrega instalações do cache ou realiza nova busca."""
-        cached_data = self._load_cache()
-        if cached_data and (time.time() - cached_data.get("last_updated", 0)) < 86400:  # 24 horas
-            self.installations = [PythonInstallation.from_dict(inst) for inst in cached_data.get("installations", [])]
-        else:
-            self.find_python_installations()
+        with phase(self.sink, self.timings, "discovery") as span:
+            cached_data = self._load_cache()
+            if cached_data and (time.time() - cached_data.get("last_updated", 0)) < 86400:  # 24 horas
+                span["source"] = "cache"
+                self.installations = [PythonInstallation.from_dict(inst) for inst in cached_data.get("installations", [])]
+                self.unhealthy = [PythonInstallation.from_dict(inst) for inst in cached_data.get("unhealthy", [])]
+                self._rejected = cached_data.get("rejected", {})
+            else:
+                span["source"] = "scan"
+                self.find_python_installations()
+            span["installations"] = len(self.installations)
 
     def _load_cache(self) -> Optional[dict]:
         """Carrega o cache de instalações."""
-        if os.path.exists(CACHE_FILE):
-            try:
-                with open(CACHE_FILE, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                console.print(f"[yellow]Aviso:[/yellow] Erro ao carregar cache: {e}")
-        return None
+        return read_state(CACHE_FILE, CACHE_SCHEMA_VERSION)
 
     def _save_cache(self):
         """Salva as instalações no cache."""
         data = {
             "installations": [inst.to_dict() for inst in self.installations],
+            "unhealthy": [inst.to_dict() for inst in self.unhealthy],
+            # Candidatos que não são um Python ({caminho: assinatura})
+            "rejected": self._rejected,
             "last_updated": time.time()
         }
         try:
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(data, f, indent=4)
+            with locked(CACHE_FILE):
+                write_state(CACHE_FILE, data, CACHE_SCHEMA_VERSION)
         except Exception as e:
-            console.print(f"[yellow]Aviso:[/yellow] Erro ao salvar cache: {e}")
-
-    def find_python_installations(self):
-        """Procura por instalações do Python no sistema."""
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("Procurando instalações do Python...", total=None)
-            
-            self.installations = []
-            seen_paths = set()
-
-            path_dirs = os.environ.get("PATH", "").split(os.pathsep)
-            for directory in path_dirs:
-                if not os.path.exists(directory):
-                    continue
-
-                pattern = os.path.join(directory, "python*")
-                for file_path in glob.glob(pattern):
-                    if os.path.isdir(file_path) or file_path in seen_paths:
-                        continue
-                    
-                    if os.access(file_path, os.X_OK):
-                        try:
-                            result = subprocess.run(
-                                [file_path, "--version"],
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                text=True,
-                                timeout=2
-                            )
-                            output = result.stdout.strip() or result.stderr.strip()
-                            
-                            if output.startswith("Python"):
-                                version = output.split()[1]
-                                seen_paths.add(file_path)
-                                inst = PythonInstallation(version, os.path.abspath(file_path))
-                                self.installations.append(inst)
-                        except Exception:
-                            continue
-
-            progress.update(task, completed=True)
+            self.sink.message(f"Erro ao salvar cache: {e}", "warning")
+
+    def find_python_installations(self, force: bool = False):
+        """Procura por instalações do Python no sistema e verifica a saúde de cada uma.
+
+        Interpretadores já marcados como problemáticos, e candidatos que não
+        são um Python, cujo executável não mudou são reaproveitados do cache
+        sem nova consulta, a menos que `force` seja verdadeiro. Os
+        problemáticos ficam em `self.unhealthy`.
+        """
+        with phase(self.sink, self.timings, "scan") as span:
+            previous, rejected = {}, {}
+            if not force:
+                cached = self._load_cache() or {}
+                previous = {data["executable"]: PythonInstallation.from_dict(data)
+                            for data in cached.get("unhealthy", [])}
+                rejected = cached.get("rejected", {})
+            reused = []
+
+            def probe(file_path: str):
+                path = os.path.abspath(file_path)
+                signature = interpreter_signature(file_path)
+                old = previous.get(path)
+                if old is not None and old.signature == signature:
+                    reused.append(old)
+                    return path, old, signature
+                if path in rejected and rejected[path] == signature:
+                    return path, None, signature
+                return path, probe_interpreter(file_path), signature
+
+            # Primeiro só as consultas cronometradas; a verificação de saúde,
+            # bem mais pesada, roda depois para não distorcer a latência medida
+            with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as pool:
+                results = list(pool.map(probe, iter_candidates()))
+            found = [inst for _, inst, _ in results if inst]
+            check_installations([inst for inst in found if inst not in reused])
+            self.installations = [inst for inst in found if inst.healthy]
+            self.unhealthy = [inst for inst in found if not inst.healthy]
+            self._rejected = {path: signature for path, inst, signature in results
+                              if inst is None and signature}
+
+            span["installations"] = len(self.installations)
+            span["unhealthy"] = len(self.unhealthy)
             self._save_cache()
 
-    def show_python_versions(self) -> Optional[PythonInstallation]:
-        """Mostra menu de seleção de versões do Python."""
-        if not self.installations:
-            console.print("[red]Nenhuma instalação do Python encontrada![/red]")
-            return None
-
-        table = Table(title="Instalações do Python Disponíveis")
-        table.add_column("Opção", justify="right", style="cyan")
-        table.add_column("Versão", style="green")
-        table.add_column("Caminho", style="blue")
+    def default_installation(self, version: Optional[str] = None) -> Optional[PythonInstallation]:
+        """Instalação saudável mais recente (que comece com `version`, se dado).
 
-        for idx, inst in enumerate(self.installations, start=1):
-            table.add_row(str(idx), f"Python {inst.version}", inst.executable)
-
-        console.print(table)
+        Entre instalações da mesma versão (links, shims), a de inicialização
+        mais rápida.
+        """
+        candidates = [inst for inst in self.installations
+                      if version is None or inst.version.startswith(version)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda inst: (
+            tuple(-int(part) for part in re.findall(r"\d+", inst.version)[:3]),
+            inst.startup_ms if inst.startup_ms is not None else 0.0))
 
-        while True:
-            try:
-                choice = Prompt.ask(
-                    "Selecione o número da versão",
-                    choices=[str(i) for i in range(1, len(self.installations) + 1)]
-                )
-                return self.installations[int(choice) - 1]
-            except (ValueError, IndexError):
-                console.print("[red]Opção inválida![/red]")
+    def show_python_versions(self) -> Optional[PythonInstallation]:
+        """Mostra menu de seleção de versões do Python."""
+        from ..ui.prompts import select_python_installation
+        return select_python_installation(self.installations)
 
     def create_venv(self, python_inst: PythonInstallation, venv_dir: str, 
-                   requirements: Optional[List[str]] = None):
-        """Cria e configura um ambiente virtual."""
-        with Progress(console=console) as progress:
-            task1 = progress.add_task("Criando ambiente virtual...", total=100)
-            
+                   requirements: Optional[List[str]] = None,
+                   requirement_files: Optional[List[str]] = None,
+                   constraint_files: Optional[List[str]] = None,
+                   slim: bool = False, prefer_cache: bool = False):
+        """Cria e configura um ambiente virtual.
+
+        `requirement_files`/`constraint_files` são arquivos no formato do pip
+        (`-r`/`-c`, inclusive com `--hash`); a trava resultante é registrada nos
+        metadados do ambiente. Com `slim`, testes, bytecode de outras versões e
+        documentação são removidos após a instalação. Pacotes com versão fixa
+        presentes no cache de wheels são instalados dele; com `prefer_cache`,
+        também os sem versão fixa (a versão do cache, não a mais recente).
+        """
+        mark = len(self.timings.spans)
+        log_dir = os.path.join(venv_dir, LOG_DIR_NAME)
+        requirements = requirements or []
+        requirement_files = requirement_files or []
+        constraint_files = constraint_files or []
+        sink = self.sink
+        installed_packages = []
+        failed_packages = []
+        freeze_lines: List[str] = []
+        lock = None
+        slim_report = None
+        # Ler os arquivos -r/-c antes de criar qualquer coisa no disco
+        requirement_set = self._read_requirement_files(requirement_files, constraint_files)
+
+        with phase(sink, self.timings, "create", venv_dir=venv_dir,
+                   python=python_inst.version):
             try:
                 # Criar o ambiente virtual
-                cmd = [python_inst.executable, "-m", "venv", "--upgrade-deps", venv_dir]
-                subprocess.run(cmd, check=True, capture_output=True)
-                progress.update(task1, advance=60)
+                with phase(sink, self.timings, "venv", python=python_inst.version):
+                    cmd = [python_inst.executable, "-m", "venv", "--upgrade-deps", venv_dir]
+                    run_logged(cmd, os.path.join(log_dir, "venv.log"))
+                sink.emit(PROGRESS, completed=30)
 
                 # Verificar se o pip está funcionando
-                pip_exec = self._get_pip_path(venv_dir)
-                try:
-                    subprocess.run([pip_exec, "--version"], 
-                                 check=True, capture_output=True)
-                except subprocess.CalledProcessError:
-                    if os.name == "nt":
-                        # No Windows, tente usar python -m pip
-                        pip_exec = [os.path.join(venv_dir, "Scripts", "python.exe"), "-m", "pip"]
-                    else:
-                        pip_exec = [os.path.join(venv_dir, "bin", "python"), "-m", "pip"]
-
-                installed_packages = []
-
-                # Instalar requisitos adicionais
-                if requirements:
-                    for package in requirements:
-                        try:
-                            if isinstance(pip_exec, list):
-                                subprocess.run([*pip_exec, "install", package], 
-                                            check=True, capture_output=True)
-                            else:
-                                subprocess.run([pip_exec, "install", package], 
-                                            check=True, capture_output=True)
-                            installed_packages.append(package)
-                            self.package_manager.add_package_usage(package)
-                        except subprocess.CalledProcessError as e:
-                            console.print(f"[yellow]Aviso:[/yellow] Erro ao instalar {package}: {e}")
-                            continue
-
-                progress.update(task1, advance=20)
+                pip_cmd = [self._get_pip_path(venv_dir)]
+                with phase(sink, self.timings, "pip_check"):
+                    try:
+                        run_logged([*pip_cmd, "--version"],
+                                   os.path.join(log_dir, "pip-check.log"))
+                    except (subprocess.CalledProcessError, OSError):
+                        if os.name == "nt":
+                            # No Windows, tente usar python -m pip
+                            pip_cmd = [os.path.join(venv_dir, "Scripts", "python.exe"), "-m", "pip"]
+                        else:
+                            pip_cmd = [os.path.join(venv_dir, "bin", "python"), "-m", "pip"]
+                sink.emit(PROGRESS, completed=35)
+
+                # Instalar requisitos adicionais (35% a 90% do progresso)
+                has_files = bool(requirement_files or constraint_files)
+                steps = len(requirements) + has_files
+                share = 55 / steps if steps else 0
+                if has_files:
+                    lock = self._install_requirement_files(
+                        python_inst, pip_cmd, venv_dir, requirement_set, requirement_files,
+                        constraint_files, share)
+                    installed_packages.extend(lock.pop("names"))
+                for index, package in enumerate(requirements, start=has_files):
+                    pip_progress = PipProgress()
+                    base = 35 + index * share
+
+                    def on_line(line, package=package, pip_progress=pip_progress, base=base):
+                        if pip_progress.feed(line):
+                            sink.emit(PROGRESS,
+                                      completed=base + share * pip_progress.fraction,
+                                      description=f"{package}: {pip_progress.status}")
+
+                    try:
+                        with phase(sink, self.timings, "install", package=package) as span:
+                            self._install_package(pip_cmd, package, log_dir, on_line, span,
+                                                  prefer_cache)
+                        installed_packages.append(package)
+                        self.package_manager.add_package_usage(package, python_inst.version)
+                        sink.emit(PACKAGE_INSTALLED, package=package)
+                    except CommandError as e:
+                        failed_packages.append(package)
+                        sink.emit(PACKAGE_FAILED, package=package, returncode=e.returncode,
+                                  log=e.log_path, tail=e.tail)
+                    finally:
+                        sink.emit(PROGRESS, completed=base + share)
+
+                sink.emit(PROGRESS, completed=90, description="Finalizando...")
 
                 # Criar requirements.txt
-                self._create_requirements(venv_dir, installed_packages)
+                with phase(sink, self.timings, "requirements"):
+                    requirements_file = self._create_requirements(
+                        venv_dir, installed_packages, pip_cmd, freeze_lines)
+                    if lock is not None:
+                        lock["installed"] = freeze_lines
+
+                if slim:
+                    with phase(sink, self.timings, "slim") as span:
+                        slim_report = slim_env(venv_dir)
+                        span["bytes_saved"] = slim_report.total_bytes
+                    sink.message(f"Ambiente reduzido em {format_size(slim_report.total_bytes)} "
+                                 f"({slim_report.total_files} arquivos removidos)", "success")
 
                 # Criar arquivo de metadados
-                self._create_metadata(venv_dir, python_inst)
-
-                progress.update(task1, advance=20)
-
-                console.print("[green]✓[/green] Ambiente virtual criado com sucesso!")
-
-            except subprocess.CalledProcessError as e:
-                console.print(f"[red]Erro ao criar ambiente virtual: {e}[/red]")
+                with phase(sink, self.timings, "metadata"):
+                    metadata_file = self._create_metadata(
+                        venv_dir, python_inst, self.timings.since(mark), lock)
+                    self.registry.register(venv_dir, python_inst)
+
+                sink.emit(PROGRESS, completed=100)
+                sink.message("Ambiente virtual criado com sucesso!", "success")
+
+            except (subprocess.CalledProcessError, OSError, FetchError) as e:
+                sink.message(f"Erro ao criar ambiente virtual: {e}", "error")
+                if isinstance(e, CommandError):
+                    sink.emit(COMMAND_FAILED, cmd=e.cmd, returncode=e.returncode,
+                              log=e.log_path, tail=e.tail)
                 if os.path.exists(venv_dir):
+                    self._keep_failed_logs(venv_dir)
                     shutil.rmtree(venv_dir)
                 raise
 
+        sink.emit(VENV_CREATED, venv_dir=venv_dir, python=python_inst.to_dict(),
+                  installed=installed_packages, failed=failed_packages,
+                  requirements_file=requirements_file, metadata_file=metadata_file,
+                  slim=slim_report.to_dict() if slim_report else None)
+
+    def _install_package(self, pip_cmd: List[str], package: str, log_dir: str,
+                         on_line=None, span: Optional[dict] = None,
+                         prefer_cache: bool = False):
+        """Instala um pacote, tentando primeiro o cache local de wheels."""
+        commands = install_commands(pip_cmd, package, prefer_cache=prefer_cache)
+        for index, cmd in enumerate(commands):
+            try:
+                run_logged(cmd, os.path.join(log_dir, f"install-{log_name(package)}.log"), on_line)
+                from_cache = index < len(commands) - 1
+                if span is not None:
+                    span["source"] = "cache" if from_cache else "index"
+                if from_cache:
+                    artifact = cached_artifact(package, any_version=prefer_cache)
+                    version = artifact_version(artifact) if artifact else "?"
+                    if span is not None:
+                        span["version"] = version
+                    self.sink.message(f"{package}: versão {version} instalada do cache de wheels")
+                return
+            except CommandError:
+                if index == len(commands) - 1:
+                    raise
+
+    def _read_requirement_files(self, requirement_files: List[str],
+                                constraint_files: List[str]) -> RequirementsSet:
+        """Lê os arquivos `-r`/`-c` (e os que eles incluem).
+
+        Levanta `ValueError` se algum não existir ou não puder ser lido.
+        """
+        requirement_set = RequirementsSet()
+        files = [(path, False) for path in requirement_files]
+        files += [(path, True) for path in constraint_files]
+        for path, constraint in files:
+            try:
+                requirement_set.read(path, constraint)
+            except OSError as e:
+                raise ValueError(f"Não foi possível ler {e.filename or path}: "
+                                 f"{e.strerror or e}") from e
+            except UnicodeDecodeError as e:
+                raise ValueError(f"{path} não está em UTF-8: {e}") from e
+        return requirement_set
+
+    def _install_requirement_files(self, python_inst: PythonInstallation,
+                                   pip_cmd: List[str], venv_dir: str,
+                                   requirement_set: RequirementsSet,
+                                   requirement_files: List[str], constraint_files: List[str],
+                                   share: float) -> dict:
+        """Baixa os artefatos travados em paralelo e instala os arquivos `-r`/`-c`.
+
+        Retorna a trava a registrar nos metadados (com os nomes pedidos em
+        "names"). Falhas aqui interrompem a criação do ambiente.
+        """
+        sink = self.sink
+        pip_progress = PipProgress()
+
+        def on_line(line):
+            if pip_progress.feed(line):
+                sink.emit(PROGRESS, completed=35 + share * pip_progress.fraction,
+                          description=pip_progress.status)
+
+        # O lock compartilhado do cache impede que o `gc` remova os artefatos
+        # baixados antes da instalação (outras criações podem rodar ao mesmo tempo)
+        with locked(WHEEL_CACHE_DIR, shared=True):
+            with phase(sink, self.timings, "fetch") as span:
+                python = get_python_path(venv_dir)
+                artifacts, skipped = fetch_artifacts(requirement_set.requirements,
+                                                     interpreter_tags(python),
+                                                     requirement_set.index_url, python=python)
+                span["fetched"] = len(artifacts)
+                span["skipped"] = len(skipped)
+            if skipped:
+                sink.message(f"{len(skipped)} requisito(s) serão baixados pelo pip", "warning")
+
+            args = [arg for path in requirement_files for arg in ("-r", path)]
+            args += [arg for path in constraint_files for arg in ("-c", path)]
+            for link in requirement_set.find_links:
+                args += ["--find-links", link]
+            commands = [[*pip_cmd, "install", "--progress-bar", "off",
+                         "--find-links", WHEEL_CACHE_DIR, *args]]
+            if artifacts and not skipped:
+                commands.insert(0, [*pip_cmd, *install_args(args)])
+
+            log_path = os.path.join(venv_dir, LOG_DIR_NAME, "install-requirements.log")
+            with phase(sink, self.timings, "install", files=len(requirement_set.files)) as span:
+                for index, cmd in enumerate(commands):
+                    try:
+                        run_logged(cmd, log_path, on_line)
+                        span["source"] = "cache" if index < len(commands) - 1 else "index"
+                        break
+                    except CommandError:
+                        if index == len(commands) - 1:
+                            raise
+        sink.emit(PROGRESS, completed=35 + share)
+
+        for name in requirement_set.names:
+            self.package_manager.add_package_usage(name, python_inst.version)
+            sink.emit(PACKAGE_INSTALLED, package=name)
+
+        return {
+            "names": requirement_set.names,
+            "files": requirement_set.files,
+            "artifacts": [artifact.to_dict() for artifact in artifacts],
+            "skipped": skipped
+        }
+
+    def _keep_failed_logs(self, venv_dir: str):
+        """Move os logs de um ambiente que falhou para LOGS_DIR antes de removê-lo."""
+        log_dir = os.path.join(venv_dir, LOG_DIR_NAME)
+        if not os.path.isdir(log_dir):
+            return
+        name = os.path.basename(os.path.abspath(venv_dir))
+        target = os.path.join(LOGS_DIR, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        try:
+            os.makedirs(LOGS_DIR, exist_ok=True)
+            shutil.move(log_dir, target)
+            self.sink.message(f"Logs preservados em {target}", "warning")
+        except OSError:
+            pass
+
     def _get_pip_path(self, venv_dir: str) -> str:
         """Retorna o caminho do executável pip no ambiente virtual."""
-        if os.name == "nt":
-            return os.path.join(venv_dir, "Scripts", "pip.exe")
-        return os.path.join(venv_dir, "bin", "pip")
-
-    def _create_requirements(self, venv_dir: str, packages: List[str]):
-        """Cria o arquivo requirements.txt."""
-        requirements_file = os.path.join(venv_dir, "requirements.txt")
-        
+        return get_pip_path(venv_dir)
+
+    def _create_requirements(self, venv_dir: str, packages: List[str],
+                             pip_cmd: Optional[List[str]] = None,
+                             installed: Optional[List[str]] = None) -> Optional[str]:
+        """Cria o arquivo requirements.txt e retorna seu caminho.
+
+        Se `installed` for dado, recebe as linhas do `pip freeze`.
+        """
         try:
             # Pegar as versões exatas dos pacotes instalados
-            pip_exec = self._get_pip_path(venv_dir)
-            if isinstance(pip_exec, list):
-                result = subprocess.run([*pip_exec, "freeze"], 
-                                     capture_output=True, text=True, check=True)
-            else:
-                result = subprocess.run([pip_exec, "freeze"], 
-                                     capture_output=True, text=True, check=True)
+            pip_cmd = pip_cmd or [self._get_pip_path(venv_dir)]
+            installed = [] if installed is None else installed
+            run_logged([*pip_cmd, "freeze"],
+                       os.path.join(venv_dir, LOG_DIR_NAME, "freeze.log"),
+                       installed.append)
             
             # Filtrar apenas os pacotes que foram instalados explicitamente
-            installed = result.stdout.strip().split('\n')
-            package_map = {p.split('==')[0].lower(): p for p in installed}
-            
-            requirements = []
-            for package in packages:
-                if package.lower() in package_map:
-                    requirements.append(package_map[package.lower()])
-                else:
-                    requirements.append(package)
-
-            # Escrever o arquivo requirements.txt
-            with open(requirements_file, 'w') as f:
-                f.write("# Pacotes instalados durante a criação do ambiente virtual\n")
-                f.write("# Criado por fast-venv em " + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + "\n\n")
-                f.write('\n'.join(sorted(requirements)))
+            requirements_file = write_requirements(venv_dir, pin_requirements(packages, installed))
                 
-            console.print(f"[green]✓[/green] Arquivo requirements.txt criado em {requirements_file}")
+            self.sink.message(f"Arquivo requirements.txt criado em {requirements_file}", "success")
+            return requirements_file
             
         except Exception as e:
-            console.print(f"[yellow]Aviso:[/yellow] Erro ao criar requirements.txt: {e}")
+            self.sink.message(f"Erro ao criar requirements.txt: {e}", "warning")
+            return None
 
-    def _create_metadata(self, venv_dir: str, python_inst: PythonInstallation):
+    def _create_metadata(self, venv_dir: str, python_inst: PythonInstallation,
+                         spans: Optional[List[Span]] = None,
+                         lock: Optional[dict] = None) -> str:
         """Cria arquivo de metadados do ambiente."""
-        metadata = {
-            "created_at": datetime.now().isoformat(),
-            "python_version": python_inst.version,
-            "python_path": python_inst.executable,
-            "platform": platform.platform(),
-            "creator": "venv-manager"
-        }
-        
-        metadata_file = os.path.join(venv_dir, ".venv-metadata.json")
-        with open(metadata_file, "w") as f:
-            json.dump(metadata, f, indent=4)
+        return write_metadata(venv_dir, python_inst, spans, lock)
 
     def show_activation_instructions(self, venv_dir: str):
         """Mostra instruções de ativação do ambiente virtual."""
-        console.print("\n[bold green]Ambiente virtual criado com sucesso![/bold green]")
-        
-        if os.name == "nt":
-            activate_cmd = f"{venv_dir}\\Scripts\\activate.bat"
-            console.print(Panel(f"""
-Para ativar o ambiente virtual, execute:
-
-[bold cyan]cd {venv_dir}
-{activate_cmd}[/bold cyan]
-
-Para desativar, simplesmente digite: [bold cyan]deactivate[/bold cyan]
-"""))
-        else:
-            activate_cmd = f"source {venv_dir}/bin/activate"
-            console.print(Panel(f"""
-Para ativar o ambiente virtual, execute:
-
-[bold cyan]cd {venv_dir}
-{activate_cmd}[/bold cyan]
-
-Para desativar, simplesmente digite: [bold cyan]deactivate[/bold cyan]
-"""))
\ No newline at end of file
+        from ..ui.menus import show_activation_instructions
+        show_activation_instructions(venv_dir)
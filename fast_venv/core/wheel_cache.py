@@ -0,0 +1,110 @@
+# fast_venv/core/wheel_cache.py
+"""Cache local de distribuições (`WHEEL_CACHE_DIR`) compartilhado entre ambientes.
+
+Os arquivos são baixados (ou construídos como wheels) uma única vez e depois
+instalados em qualquer ambiente com `pip install --no-index --find-links`.
+"""
+import os
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from ..config import LOGS_DIR, WHEEL_CACHE_DIR
+from .environment import pinned_version, requirement_name
+from .process import log_name, run_logged
+from .state import locked
+
+_SDIST_SUFFIXES = (".tar.gz", ".zip", ".tar.bz2")
+
+
+def _run_pip(python: str, subcommand: str, dest_flag: str, packages: Sequence[str],
+             extra_args: Sequence[str], cache_dir: str) -> str:
+    os.makedirs(cache_dir, exist_ok=True)
+    log_path = os.path.join(LOGS_DIR, f"{subcommand}-{log_name('-'.join(packages))[:100]}.log")
+    cmd = [python, "-m", "pip", subcommand, "--progress-bar", "off",
+           dest_flag, cache_dir, "--find-links", cache_dir, *extra_args, *packages]
+    with locked(cache_dir):
+        run_logged(cmd, log_path)
+    return log_path
+
+
+def download(python: str, packages: Sequence[str], extra_args: Sequence[str] = (),
+             cache_dir: str = WHEEL_CACHE_DIR) -> str:
+    """Baixa `packages` (e dependências) para o cache usando o pip de `python`.
+
+    Arquivos já presentes no cache não são baixados de novo. O download é
+    serializado entre processos com um lock no diretório do cache. Retorna o
+    caminho do log; levanta `CommandError` se o pip falhar.
+    """
+    return _run_pip(python, "download", "--dest", packages, extra_args, cache_dir)
+
+
+def build_wheels(python: str, packages: Sequence[str], extra_args: Sequence[str] = (),
+                 cache_dir: str = WHEEL_CACHE_DIR) -> str:
+    """Como `download`, mas constrói wheels para o que só tem sdist (`pip wheel`)."""
+    return _run_pip(python, "wheel", "--wheel-dir", packages, extra_args, cache_dir)
+
+
+def _artifact(filename: str) -> Tuple[str, str]:
+    """(nome normalizado, versão) de uma distribuição pelo nome do arquivo."""
+    if filename.endswith(".whl"):
+        parts = filename.split("-")
+        return requirement_name(parts[0]), parts[1] if len(parts) > 1 else ""
+    for suffix in _SDIST_SUFFIXES:
+        if filename.endswith(suffix):
+            name, _, version = filename[:-len(suffix)].rpartition("-")
+            return requirement_name(name), version
+    return "", ""
+
+
+def _version_key(version: str) -> tuple:
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+def cached_artifact(package: str, cache_dir: str = WHEEL_CACHE_DIR,
+                    any_version: bool = False) -> Optional[str]:
+    """Arquivo do cache que atende `package`, ou None.
+
+    Só requisitos com versão fixa (`nome==versão`) são atendidos, pelo arquivo
+    dessa versão, para que a instalação normal continue trazendo a versão mais
+    recente do índice. Com `any_version`, serve o arquivo de versão mais alta
+    do projeto, mesmo que haja uma mais nova no índice.
+    """
+    version = pinned_version(package)
+    if version is None and not any_version:
+        return None
+    name = requirement_name(package)
+    try:
+        artifacts = [(filename, _artifact(filename)) for filename in os.listdir(cache_dir)]
+    except OSError:
+        return None
+    matches = [(filename, artifact[1]) for filename, artifact in artifacts
+               if artifact[0] == name and (version is None or artifact[1] == version)]
+    if not matches:
+        return None
+    return max(matches, key=lambda match: (_version_key(match[1]), match[0]))[0]
+
+
+def artifact_version(filename: str) -> str:
+    """Versão de uma distribuição pelo nome do arquivo."""
+    return _artifact(filename)[1]
+
+
+def install_args(packages: Sequence[str], cache_dir: str = WHEEL_CACHE_DIR) -> List[str]:
+    """Argumentos do `pip install` para instalar só a partir do cache."""
+    return ["install", "--progress-bar", "off", "--no-index", "--find-links", cache_dir,
+            *packages]
+
+
+def install_commands(pip_cmd: List[str], package: str,
+                     cache_dir: str = WHEEL_CACHE_DIR,
+                     prefer_cache: bool = False) -> List[List[str]]:
+    """Comandos a tentar, em ordem, para instalar `package` em um ambiente.
+
+    Se o cache atender `package` (ver `cached_artifact`; `prefer_cache` aceita
+    qualquer versão em cache), a primeira tentativa instala sem acessar a
+    rede; a última é sempre a instalação normal pelo índice.
+    """
+    commands = [[*pip_cmd, "install", "--progress-bar", "off", package]]
+    if cached_artifact(package, cache_dir, prefer_cache):
+        commands.insert(0, [*pip_cmd, *install_args([package], cache_dir)])
+    return commands
@@ -1,21 +1,25 @@
 # fast_venv/main.py
 import os
 import sys
-from rich.table import Table
-from rich.prompt import Prompt
 
 # Adiciona o diretório pai ao path para permitir importações relativas
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from fast_venv.core.profiling import Profiler, parse_profile_flag
 from fast_venv.core.venv_manager import VenvManager
-from fast_venv.ui.console import console
-from fast_venv.ui.menus import show_menu, show_config_menu
-from fast_venv.ui.prompts import select_packages
 from fast_venv.cli import main_cli
 
 def main_interactive():
     """Função principal para interface interativa."""
-    manager = VenvManager()
+    # rich só é carregado no modo interativo; o CLI sem TTY/--json não o importa
+    from rich.table import Table
+    from rich.prompt import Prompt
+    from fast_venv.ui.console import console
+    from fast_venv.ui.menus import show_menu, show_config_menu
+    from fast_venv.ui.prompts import select_packages
+    from fast_venv.ui.rich_sink import RichSink
+
+    manager = VenvManager(RichSink(console))
     
     while True:
         choice = show_menu()
@@ -33,7 +37,7 @@ def main_interactive():
                 continue
 
             # Selecionar pacotes
-            packages = select_packages(manager.package_manager)
+            packages = select_packages(manager.package_manager, python_inst.version)
 
             try:
                 # Criar ambiente
@@ -53,10 +57,10 @@ def main_interactive():
                 
             table = Table(title="Pacotes Mais Populares")
             table.add_column("Pacote", style="cyan")
-            table.add_column("Usos", justify="right", style="green")
+            table.add_column("Relevância", justify="right", style="green")
             
-            for package, count in popular:
-                table.add_row(package, str(count))
+            for package, score in popular:
+                table.add_row(package, f"{score:.2f}")
             
             console.print(table)
             Prompt.ask("\nPressione Enter para continuar")
@@ -71,6 +75,16 @@ def main_interactive():
 
 def main():
     """Função principal que gerencia tanto o modo CLI quanto o interativo."""
+    # --profile[=cprofile|wall] vale para qualquer comando e é removido antes do argparse
+    try:
+        profile_mode, sys.argv[1:] = parse_profile_flag(sys.argv[1:])
+    except ValueError as e:
+        print(f"erro: {e}", file=sys.stderr)
+        sys.exit(2)
+    profiler = Profiler(profile_mode) if profile_mode else None
+    if profiler:
+        profiler.start()
+
     try:
         # Verificar se há argumentos de linha de comando
         if len(sys.argv) > 1:
@@ -78,8 +92,11 @@ def main():
         else:
             main_interactive()
     except KeyboardInterrupt:
-        console.print("\n[yellow]Operação cancelada pelo usuário.[/yellow]")
+        print("\nOperação cancelada pelo usuário.", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if profiler:
+            print(profiler.report(profiler.stop()), file=sys.stderr)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,5 +2,6 @@
 from .console import console
 from .menus import show_menu, show_config_menu
 from .prompts import select_packages
+from .rich_sink import RichSink
 
-__all__ = ['console', 'show_menu', 'show_config_menu', 'select_packages']
\ No newline at end of file
+__all__ = ['console', 'show_menu', 'show_config_menu', 'select_packages', 'RichSink']
\ No newline at end of file
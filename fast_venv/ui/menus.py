@@ -8,6 +8,7 @@ from rich.prompt import Prompt, Confirm
 from rich.table import Table
 from .console import console
 from ..config import CACHE_FILE, FAVORITE_PACKAGES_FILE
+from ..core.environment import activation_command
 
 def show_menu() -> str:
     """Mostra o menu principal."""
@@ -33,6 +34,18 @@ def show_menu() -> str:
         default="1"
     )
 
+def show_activation_instructions(venv_dir: str):
+    """Mostra instruções de ativação do ambiente virtual."""
+    console.print("\n[bold green]Ambiente virtual criado com sucesso![/bold green]")
+    console.print(Panel(f"""
+Para ativar o ambiente virtual, execute:
+
+[bold cyan]cd {venv_dir}
+{activation_command(venv_dir)}[/bold cyan]
+
+Para desativar, simplesmente digite: [bold cyan]deactivate[/bold cyan]
+"""))
+
 def open_config_file(file_path: str):
     """Abre um arquivo de configuração."""
     try:
@@ -77,5 +90,5 @@ def show_config_menu(manager):
             manager.package_manager.clear_package_history()
             console.print("[green]Histórico de pacotes limpo com sucesso![/green]")
     elif choice == "4":
-        manager.find_python_installations()
+        manager.find_python_installations(force=True)
         console.print("[green]Cache atualizado com sucesso![/green]")
\ No newline at end of file
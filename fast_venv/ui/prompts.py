@@ -1,23 +1,51 @@
 # fast_venv/ui/prompts.py
-from typing import List
+from typing import List, Optional
 from rich.table import Table
 from rich.prompt import Prompt, Confirm
 from ..core.package_manager import PackageManager
+from ..core.python_installation import PythonInstallation
 from .console import console
 
-def select_packages(package_manager: PackageManager) -> List[str]:
+def select_python_installation(installations: List[PythonInstallation]) -> Optional[PythonInstallation]:
+    """Mostra menu de seleção de versões do Python."""
+    if not installations:
+        console.print("[red]Nenhuma instalação do Python encontrada![/red]")
+        return None
+
+    table = Table(title="Instalações do Python Disponíveis")
+    table.add_column("Opção", justify="right", style="cyan")
+    table.add_column("Versão", style="green")
+    table.add_column("Caminho", style="blue")
+
+    for idx, inst in enumerate(installations, start=1):
+        table.add_row(str(idx), f"Python {inst.version}", inst.executable)
+
+    console.print(table)
+
+    while True:
+        try:
+            choice = Prompt.ask(
+                "Selecione o número da versão",
+                choices=[str(i) for i in range(1, len(installations) + 1)]
+            )
+            return installations[int(choice) - 1]
+        except (ValueError, IndexError):
+            console.print("[red]Opção inválida![/red]")
+
+def select_packages(package_manager: PackageManager,
+                    python_version: Optional[str] = None) -> List[str]:
     """Interface para seleção de pacotes."""
     packages = []
     
-    # Mostrar pacotes populares
-    popular = package_manager.get_popular_packages()
+    # Mostrar pacotes populares para a versão do Python escolhida
+    popular = package_manager.get_popular_packages(python_version=python_version)
     if popular:
         table = Table(title="Pacotes Populares")
         table.add_column("Pacote", style="cyan")
-        table.add_column("Usos", justify="right", style="green")
+        table.add_column("Relevância", justify="right", style="green")
         
-        for package, count in popular:
-            table.add_row(package, str(count))
+        for package, score in popular:
+            table.add_row(package, f"{score:.2f}")
         
         console.print(table)
         
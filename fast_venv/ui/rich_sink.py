@@ -0,0 +1,192 @@
+# fast_venv/ui/rich_sink.py
+from typing import Optional
+import time
+from rich.console import Console
+from rich.markup import escape
+from rich.panel import Panel
+from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
+from rich.text import Text
+from .console import console as default_console
+from .menus import show_activation_instructions
+from ..core.registry import format_size
+from ..core.events import (ACTIVATION, COMMAND_FAILED, ENVIRONMENTS, GC_REPORT, INSTALLATIONS, MESSAGE,
+                           PACKAGE_FAILED, PHASE_FINISHED, PHASE_STARTED, PREFETCH,
+                           PROGRESS, TIMINGS, UPGRADES, Event, EventSink, format_startup)
+
+# Linhas do log exibidas quando a instalação de um pacote falha
+PACKAGE_TAIL_LINES = 5
+
+class RichSink(EventSink):
+    """Renderiza os eventos do núcleo com barras de progresso, tabelas e painéis."""
+
+    _STYLES = {
+        "success": "[green]✓[/green] {}",
+        "warning": "[yellow]Aviso:[/yellow] {}",
+        "error": "[red]{}[/red]",
+        "info": "[green]{}[/green]"
+    }
+
+    def __init__(self, console: Optional[Console] = None):
+        self.console = console or default_console
+        self._progress: Optional[Progress] = None
+        self._task = None
+
+    def handle(self, event: Event):
+        data = event.data
+        if event.kind == PHASE_STARTED and data["phase"] == "scan":
+            self._start(Progress(SpinnerColumn(),
+                                 TextColumn("[progress.description]{task.description}"),
+                                 console=self.console),
+                        "Procurando instalações do Python...", None)
+        elif event.kind == PHASE_STARTED and data["phase"] == "create":
+            self._start(Progress(console=self.console), "Criando ambiente virtual...", 100)
+        elif event.kind == PHASE_FINISHED and data["phase"] in ("scan", "create"):
+            self._stop()
+        elif event.kind == PROGRESS and self._progress is not None:
+            fields = {"completed": data["completed"]}
+            if data.get("description"):
+                fields["description"] = escape(data["description"])
+            self._progress.update(self._task, **fields)
+        elif event.kind == MESSAGE:
+            self.console.print(self._STYLES.get(data["level"], "{}").format(escape(data["text"])))
+        elif event.kind == PACKAGE_FAILED:
+            where = f" em {escape(data['venv_dir'])}" if data.get("venv_dir") else ""
+            self.console.print(f"[yellow]Aviso:[/yellow] Erro ao instalar {escape(data['package'])}"
+                               f"{where} (código {data['returncode']})")
+            self._show_tail(data, PACKAGE_TAIL_LINES)
+        elif event.kind == COMMAND_FAILED:
+            self._show_tail(data)
+        elif event.kind == TIMINGS:
+            self._show_timings(data["spans"])
+        elif event.kind == ACTIVATION:
+            show_activation_instructions(data["venv_dir"])
+        elif event.kind == INSTALLATIONS:
+            self.console.print("\n[bold]Versões Python disponíveis:[/bold]")
+            for inst in data["installations"]:
+                self.console.print(f"Python {inst['version']} - {escape(inst['executable'])}"
+                                   f"[dim]{format_startup(inst)}[/dim]")
+            for inst in data.get("unhealthy", []):
+                self.console.print(f"[dim]Ignorado: Python {inst['version']} - "
+                                   f"{escape(inst['executable'])} "
+                                   f"({escape(', '.join(inst['problems']))})[/dim]")
+        elif event.kind == ENVIRONMENTS:
+            self._show_envs(data["envs"])
+        elif event.kind == GC_REPORT:
+            self._show_gc_report(data)
+        elif event.kind == UPGRADES:
+            self._show_upgrades(data)
+        elif event.kind == PREFETCH:
+            self._show_prefetch(data["results"])
+
+    def _start(self, progress: Progress, description: str, total: Optional[int]):
+        self._stop()
+        self._progress = progress
+        self._progress.start()
+        self._task = self._progress.add_task(description, total=total)
+
+    def _stop(self):
+        if self._progress is not None:
+            self._progress.stop()
+            self._progress = None
+            self._task = None
+
+    def _show_tail(self, data: dict, lines: Optional[int] = None):
+        """Mostra as últimas linhas do log de um comando que falhou."""
+        tail = data.get("tail") or []
+        if lines:
+            tail = tail[-lines:]
+        if not tail:
+            return
+        self.console.print(Panel(Text("\n".join(tail)),
+                                 title=f"Últimas linhas de {data['log']}",
+                                 border_style="red"))
+
+    def _show_envs(self, envs: list):
+        """Mostra a tabela de ambientes registrados."""
+        if not envs:
+            self.console.print("[yellow]Nenhum ambiente registrado.[/yellow]")
+            return
+        table = Table(title="Ambientes Virtuais")
+        table.add_column("Caminho", style="blue")
+        table.add_column("Python", style="green")
+        table.add_column("Tamanho", justify="right", style="cyan")
+        table.add_column("Último uso", style="yellow")
+        table.add_column("Fingerprint", style="dim")
+
+        for env in envs:
+            last_used = time.strftime("%Y-%m-%d %H:%M", time.localtime(env["last_used"]))
+            table.add_row(env["path"], env["python_version"], format_size(env["size"]),
+                          last_used, env["fingerprint"])
+
+        self.console.print(table)
+
+    def _show_gc_report(self, data: dict):
+        """Mostra o que foi (ou seria) removido pela coleta de lixo."""
+        for item in data.get("failed", []):
+            self.console.print(f"[red]Não foi possível remover {escape(item['path'])}:[/red] "
+                               f"{escape(item['error'])}")
+        if not data["items"]:
+            if not data.get("failed"):
+                self.console.print("[green]Nada para remover.[/green]")
+            return
+        table = Table(title="Simulação da Limpeza" if data["dry_run"] else "Itens Removidos")
+        table.add_column("Caminho", style="blue")
+        table.add_column("Tipo", style="green")
+        table.add_column("Motivo", style="yellow")
+        table.add_column("Tamanho", justify="right", style="cyan")
+
+        for item in data["items"]:
+            table.add_row(escape(item["path"]), item["kind"], item["reason"],
+                          format_size(item["size"]))
+
+        self.console.print(table)
+        verb = "seriam liberados" if data["dry_run"] else "liberados"
+        self.console.print(f"[bold]Total:[/bold] {format_size(data['total'])} {verb}")
+
+    def _show_upgrades(self, data: dict):
+        """Mostra o resultado da atualização de um pacote em cada ambiente."""
+        table = Table(title=f"Atualização de {escape(data['package'])}")
+        table.add_column("Ambiente", style="blue")
+        table.add_column("Antes", style="yellow")
+        table.add_column("Depois", style="green")
+        table.add_column("Status")
+
+        for result in data["results"]:
+            if result.get("skipped"):
+                status = f"[dim]pulado ({escape(result['skipped'])})[/dim]"
+            elif result["error"]:
+                status = f"[red]falhou[/red] ({escape(result['error']['log'])})"
+            else:
+                status = "[green]ok[/green]"
+            table.add_row(escape(result["venv_dir"]), result["old_version"] or "-",
+                          result["new_version"] or "-", status)
+
+        self.console.print(table)
+
+    def _show_prefetch(self, results: list):
+        """Mostra os pacotes colocados no cache para cada versão de Python."""
+        table = Table(title="Cache de Wheels")
+        table.add_column("Python", style="green")
+        table.add_column("No cache", style="blue")
+        table.add_column("Falharam", style="red")
+
+        for result in results:
+            table.add_row(result["python_version"], escape(", ".join(result["cached"]) or "-"),
+                          escape(", ".join(result["failed"]) or "-"))
+
+        self.console.print(table)
+
+    def _show_timings(self, spans: list):
+        """Mostra uma tabela com o tempo gasto em cada fase."""
+        table = Table(title="Tempo por Fase")
+        table.add_column("Fase", style="cyan")
+        table.add_column("Detalhe", style="blue")
+        table.add_column("Wall (s)", justify="right", style="green")
+        table.add_column("CPU (s)", justify="right", style="yellow")
+
+        for span in spans:
+            detail = ", ".join(f"{k}={v}" for k, v in span["attrs"].items())
+            table.add_row(span["name"], escape(detail), f"{span['wall']:.3f}", f"{span['cpu']:.3f}")
+
+        self.console.print(table)
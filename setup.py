@@ -7,6 +7,10 @@ setup(
     install_requires=[
         "rich>=10.0.0"
     ],
+    extras_require={
+        # Compressão zstd com várias threads em `fvenv pack`
+        "zstd": ["zstandard>=0.15"],
+    },
     entry_points={
         'console_scripts': [
             'fvenv=fast_venv.main:main',  # Comando será 'fvenv'